@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from pathlib import Path
+from typing import Dict, List, Literal
 
 class Settings(BaseSettings):
     """
@@ -26,6 +27,12 @@ class Settings(BaseSettings):
     DEEPSEEK_API_KEY: str = ""
 
 
+    # LLM HTTP 客户端 (每个后端一个长连接会话)
+    LLM_CONNECT_TIMEOUT: float = 10     # 建连超时 (秒)
+    OLLAMA_READ_TIMEOUT: float = 60     # 本地模型读超时 (秒)
+    DEEPSEEK_READ_TIMEOUT: float = 120  # 云端模型读超时 (秒)
+    LLM_KEEPALIVE_TIMEOUT: float = 60   # 空闲连接保活时间 (秒)
+
     MAX_GPU_CONCURRENCY: int = 1
     CONTEXT_WINDOW: int = 4096
     
@@ -37,9 +44,120 @@ class Settings(BaseSettings):
     GPU_TEMP_RESUME: int = 65
     GPU_TEMP_CHECK_INTERVAL: int = 5
 
+    # 流水线各级配置 (抓取 -> 快通道 -> 补全文 -> 慢通道 -> 落盘)
+    # 慢通道 worker 数建议与 LLM 实际并发能力匹配: 本地 1~2, DeepSeek 可开到几十
+    FAST_WORKERS: int = 4
+    HYDRATE_WORKERS: int = 8  # 补全文 worker 数 (实际并发仍受 MAX_CRAWLER_CONCURRENCY 限制)
+    SLOW_WORKERS: int = 4
+    PERSIST_WORKERS: int = 1
+    FAST_QUEUE_SIZE: int = 100
+    HYDRATE_QUEUE_SIZE: int = 100
+    SLOW_QUEUE_SIZE: int = 50
+    PERSIST_QUEUE_SIZE: int = 200
+
+    # 时效性降级：排队超过预算的条目按策略处理 (短线信号几小时后价值大减)
+    LATENCY_BUDGET_SECONDS: float = 1800  # 端到端延迟预算 (秒)，0 表示不启用
+    SHED_POLICY: Literal["skip", "cheap", "downgrade"] = "cheap"  # 选项: 'skip' 直接丢弃, 'cheap' 单次分析, 'downgrade' 单次分析 + 按新闻年龄衰减
+
+    # 优先级队列 (提权量单位为秒：相当于可以插队多少秒，同时也是最大额外等待时间)
+    SOURCE_PRIORITY: Dict[str, float] = {
+        "EastMoney_API": 600,
+        "Sina_API": 600,
+        "eastmoney.com": 300,
+        "jiemian.com": 120,
+        "21jingji.com": 120,
+    }
+    KEYWORD_PRIORITY_BOOST: float = 600     # 标题命中快通道关键词
+    RECENCY_PRIORITY_BOOST: float = 300     # 刚抓到的新闻最多提权多少秒
+    RECENCY_WINDOW_SECONDS: float = 3600    # 新鲜度提权在多长时间内线性衰减到 0
+
+    # 跨源近似重复 (SimHash)：转载稿只分析一次，链接关系写入 data/signals/clusters_*.jsonl
+    NEAR_DUP_ENABLED: bool = True
+    NEAR_DUP_MAX_DISTANCE: int = 3      # 汉明距离阈值 (64 位指纹)
+    NEAR_DUP_WINDOW_HOURS: float = 24   # 只在该时间窗口内判重
+    NEAR_DUP_BODY_CHARS: int = 120      # 指纹只取正文 (归一化后) 的前 N 个字符，摘要和全文才可比
+    NEAR_DUP_MIN_TITLE_CHARS: int = 8   # 标题 (归一化后) 至少这么长才单独做标题指纹
+
+    # 阶段耗时追踪 (logs/traces.jsonl + Pipeline Stats 中的 p50/p95/p99)
+    TRACE_ENABLED: bool = True
+    TRACE_WINDOW: int = 1000  # 滚动分位数的样本窗口
+
+    # 原始数据归档 (data/raw 下的滚动分段文件)
+    RAW_ARCHIVE_COMPRESSION: str = "gzip"  # 选项: 'none', 'gzip', 'zstd' (需安装 zstandard)
+    RAW_SEGMENT_MAX_MB: int = 64
+    RAW_ARCHIVE_QUEUE_SIZE: int = 1000
+
+    # 信号落盘 (后台批量 writer)
+    SIGNAL_FLUSH_BATCH: int = 64        # 攒够多少条写一次
+    SIGNAL_FLUSH_INTERVAL: float = 1.0  # 最长多少秒写一次
+    SIGNAL_FSYNC_INTERVAL: float = 5.0  # 多少秒 fsync 一次 (0 表示只在关闭时 fsync)
+    SIGNAL_WRITER_QUEUE_SIZE: int = 10000
+
+    # 持久化工作队列 (崩溃恢复)
+    DURABLE_QUEUE_ENABLED: bool = False
+    DURABLE_QUEUE_PATH: Path = BASE_DIR / "data" / "queue.db"
+    DURABLE_QUEUE_RETENTION_DAYS: int = 7  # 已完成条目保留天数 (用于重启去重)
+
+    # 雷达扫描配置
+    SCAN_INTERVAL: float = 30.0  # 扫描周期 (秒)，按固定节拍执行，不受下游积压影响
+    URL_FRONTIER_SIZE: int = 0   # URL 边界队列容量，0 表示不限
+    # 按源自适应轮询：根据每个源的更新频率单独调整轮询间隔 (初始值为 SCAN_INTERVAL)
+    ADAPTIVE_POLLING: bool = True
+    POLL_MIN_INTERVAL: float = 10.0   # 最短轮询间隔 (秒)
+    POLL_MAX_INTERVAL: float = 600.0  # 最长轮询间隔 (秒)
+    POLL_EWMA_ALPHA: float = 0.3      # 到达速率滑动平均的平滑系数，越大越灵敏
+    # URL 规范化：移动版域名映射 (精确匹配优先，其次对下列站点做通用 m./wap. -> www.)
+    URL_HOST_ALIASES: Dict[str, str] = {}
+    URL_MOBILE_HOST_SUFFIXES: List[str] = [
+        "sina.com.cn", "eastmoney.com", "21jingji.com", "huxiu.com", "36kr.com",
+        "caixin.com", "jiemian.com", "ftchinese.com", "sohu.com", "zaobao.com.sg",
+    ]
+    # RSS 摘要长度 (字符) 达到该值时直接用摘要分析，不再抓全文；0 表示总是抓全文
+    RSS_SUMMARY_MIN_CHARS: int = 200
+    # 标题优先：摘要太短的 RSS 条目先只带标题过快通道，相关的才抓全文
+    TITLE_FIRST_ENABLED: bool = True
+    # 雷达去重存储 (64 位指纹 + 布隆过滤器 + SQLite)，超过时间窗口未再出现的 URL 会被遗忘
+    # URL 处理完才写入 DEDUP_PATH，崩溃时在途的 URL 重启后会被重新发现
+    DEDUP_PATH: Path = BASE_DIR / "data" / "seen.db"
+    DEDUP_WINDOW_HOURS: float = 168
+    DEDUP_HOT_SIZE: int = 50000            # 内存热点缓存条数
+    DEDUP_BLOOM_ENABLED: bool = True
+    DEDUP_BLOOM_CAPACITY: int = 1000000    # 布隆过滤器设计容量 (窗口内 URL 数)
+    DEDUP_BLOOM_ERROR_RATE: float = 0.001
+
     # 爬虫配置
     JINA_READER_BASE: str
     MAX_CRAWLER_CONCURRENCY: int = 10
+    # 按域名限速 (令牌桶，单位: 请求/秒)，爬虫和雷达共享；按域名后缀匹配
+    HOST_RATE_LIMITS: Dict[str, float] = {
+        "r.jina.ai": 5,
+        "eastmoney.com": 2,
+        "sina.com.cn": 2,
+        "jiemian.com": 1,
+    }
+    HOST_RATE_BURST: float = 5     # 每个桶允许的突发请求数
+    DEFAULT_HOST_RATE: float = 0   # 未配置域名的速率，0 表示不限
+
+    # 快讯接口增量轮询
+    API_CURSOR_PATH: Path = BASE_DIR / "data" / "api_cursors.json"
+    API_MAX_BACKFILL_PAGES: int = 5  # 突发时最多向后翻几页
+
+    # 正文抽取后端: 'jina' (Jina Reader), 'local' (进程内抽取), 'auto' (Jina 超时/失败时回退本地)
+    CRAWLER_BACKEND: str = "jina"
+    LOCAL_EXTRACT_HOSTS: List[str] = []  # 这些域名总是本地抽取，例如 ["jiemian.com", "eastmoney.com"]
+    JINA_SOFT_TIMEOUT: float = 8.0       # auto 模式下等待 Jina 的最长时间 (秒)
+
+    # Jina 响应本地缓存
+    JINA_CACHE_ENABLED: bool = True
+    JINA_CACHE_PATH: Path = BASE_DIR / "data" / "cache" / "jina.db"
+    JINA_CACHE_TTL_HOURS: float = 72
+    JINA_CACHE_MAX_MB: float = 512
+    JINA_OFFLINE: bool = False  # 离线模式：只读缓存，不发网络请求 (用于复现)
+    # 连接池 (长连接复用，省去每次请求的 TCP/TLS 握手和 DNS 解析)
+    CRAWLER_POOL_SIZE: int = 100          # 连接池总上限
+    CRAWLER_LIMIT_PER_HOST: int = 10      # 单个域名的连接上限
+    CRAWLER_DNS_CACHE_TTL: int = 300      # DNS 缓存时间 (秒)
+    CRAWLER_KEEPALIVE_TIMEOUT: float = 30 # 空闲连接保活时间 (秒)
 
     class Config:
         env_file = ".env"
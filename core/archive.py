@@ -0,0 +1,211 @@
+import asyncio
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+from loguru import logger
+from config.settings import settings
+from core.schema import NewsPayload
+
+try:
+    import zstandard
+except ImportError:  # 可选依赖，没装就退回 gzip
+    zstandard = None
+
+
+def url_hash(url: str) -> str:
+    """
+    URL 指纹 (sha1 前 16 位十六进制)，用作归档索引的键
+    """
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+
+class RawArchive:
+    """
+    原始数据归档：追加写入的滚动分段文件 + 偏移索引
+    所有写入由一个后台 writer 任务串行完成，避免每条新闻一次 open/close
+    每条记录单独压缩成一帧，索引记下 (分段, 偏移, 长度)，可按 URL 哈希随机读回
+    写入端不需要索引，内存中的索引只在第一次 get() 时加载；同一 URL 的旧索引行在启动时压实
+    """
+    INDEX_FILE = "index.tsv"
+
+    def __init__(self, root: Path = None, compression: str = None, segment_max_bytes: int = None):
+        self.root = root or settings.DATA_RAW_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = (compression or settings.RAW_ARCHIVE_COMPRESSION).lower()
+        if self.compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed, raw archive falls back to gzip")
+            self.compression = "gzip"
+        if self.compression not in ("none", "gzip", "zstd"):
+            logger.warning(f"Unknown raw archive compression '{self.compression}', using gzip")
+            self.compression = "gzip"
+        self.segment_max_bytes = segment_max_bytes or settings.RAW_SEGMENT_MAX_MB * 1024 * 1024
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.RAW_ARCHIVE_QUEUE_SIZE)
+        self.index: Dict[str, Tuple[str, int, int]] = {}
+        self._index_loaded = False
+        self.writer_task: Optional[asyncio.Task] = None
+        self._segment_no = 0
+        self._segment_fh = None
+        self._index_fh = None
+
+    # ---------- 生命周期 ----------
+
+    def start(self):
+        if self.writer_task:
+            return
+        self._compact_index()
+        self._open_segment()
+        self._index_fh = open(self.root / self.INDEX_FILE, 'a', encoding='utf-8')
+        self.writer_task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        """
+        发送哨兵，等待 writer 把缓冲全部落盘后关闭文件
+        """
+        if not self.writer_task:
+            return
+        await self.queue.put(None)
+        await self.writer_task
+        self.writer_task = None
+        for fh in (self._segment_fh, self._index_fh):
+            if fh:
+                fh.close()
+        self._segment_fh = self._index_fh = None
+
+    # ---------- 写入 ----------
+
+    async def append(self, news: NewsPayload):
+        """
+        提交一条原始新闻 (仅入队，真正的磁盘写入由后台 writer 完成)
+        """
+        await self.queue.put(news)
+
+    async def _writer(self):
+        while True:
+            first = await self.queue.get()
+            batch = [first]
+            # 尽量把队列里已有的记录攒成一批
+            while not self.queue.empty() and len(batch) < 256:
+                batch.append(self.queue.get_nowait())
+
+            stop = None in batch
+            records = [n for n in batch if n is not None]
+            if records:
+                try:
+                    frames = [(url_hash(n.url), self._encode(n)) for n in records]
+                    entries = await asyncio.to_thread(self._write_frames, frames)
+                    if self._index_loaded:
+                        for key, segment, offset, length in entries:
+                            self.index[key] = (segment, offset, length)
+                except Exception as e:
+                    logger.error(f"Failed to archive raw batch ({len(records)} items): {e}")
+            if stop:
+                break
+
+    def _encode(self, news: NewsPayload) -> bytes:
+        data = (news.model_dump_json() + "\n").encode('utf-8')
+        if self.compression == "gzip":
+            return gzip.compress(data)
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    def _write_frames(self, frames: List[Tuple[str, bytes]]) -> List[Tuple[str, str, int, int]]:
+        """
+        在线程中执行的阻塞写入：追加数据帧，必要时滚动到新分段
+        """
+        entries = []
+        for key, frame in frames:
+            if self._segment_fh.tell() >= self.segment_max_bytes:
+                self._segment_fh.close()
+                self._segment_no += 1
+                self._open_segment()
+            offset = self._segment_fh.tell()
+            self._segment_fh.write(frame)
+            segment = Path(self._segment_fh.name).name
+            entries.append((key, segment, offset, len(frame)))
+            self._index_fh.write(f"{key}\t{segment}\t{offset}\t{len(frame)}\n")
+        self._segment_fh.flush()
+        self._index_fh.flush()
+        return entries
+
+    # ---------- 分段 & 索引 ----------
+
+    def _segment_suffix(self) -> str:
+        return {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}.get(self.compression, ".jsonl")
+
+    def _open_segment(self):
+        if self._segment_no == 0:
+            # 接着已有的最后一个分段继续写
+            existing = sorted(self.root.glob("segment_*"))
+            self._segment_no = int(existing[-1].name[8:14]) if existing else 1
+        path = self.root / f"segment_{self._segment_no:06d}{self._segment_suffix()}"
+        if path.exists() and path.stat().st_size >= self.segment_max_bytes:
+            self._segment_no += 1
+            path = self.root / f"segment_{self._segment_no:06d}{self._segment_suffix()}"
+        self._segment_fh = open(path, 'ab')
+
+    def _read_index(self) -> Tuple[Dict[str, Tuple[str, int, int]], int]:
+        """
+        读取 index.tsv：同一键以最后一行为准，返回 (索引, 总行数)
+        """
+        index: Dict[str, Tuple[str, int, int]] = {}
+        lines = 0
+        index_path = self.root / self.INDEX_FILE
+        if not index_path.exists():
+            return index, lines
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                lines += 1
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) != 4:
+                    continue
+                key, segment, offset, length = parts
+                index[key] = (segment, int(offset), int(length))
+        return index, lines
+
+    def _load_index(self):
+        self.index, _ = self._read_index()
+        self._index_loaded = True
+
+    def _compact_index(self):
+        """
+        启动时 (writer 打开索引文件之前) 去掉被覆盖的旧行，索引文件只保留每个键的最新位置
+        """
+        index, lines = self._read_index()
+        if lines <= len(index):
+            return
+        index_path = self.root / self.INDEX_FILE
+        tmp_path = index_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for key, (segment, offset, length) in index.items():
+                f.write(f"{key}\t{segment}\t{offset}\t{length}\n")
+        tmp_path.replace(index_path)
+        logger.info(f"🧹 Compacted raw archive index: {lines} -> {len(index)} lines")
+
+    # ---------- 读取 ----------
+
+    def get(self, url_or_hash: str) -> Optional[dict]:
+        """
+        按 URL (或其哈希) 读回原始记录 (第一次调用时加载索引)
+        """
+        if not self._index_loaded:
+            self._load_index()
+        key = url_or_hash if url_or_hash in self.index else url_hash(url_or_hash)
+        entry = self.index.get(key)
+        if not entry:
+            return None
+        segment, offset, length = entry
+        path = self.root / segment
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            frame = f.read(length)
+        if path.name.endswith(".gz"):
+            frame = gzip.decompress(frame)
+        elif path.name.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read .zst raw segments")
+            frame = zstandard.ZstdDecompressor().decompress(frame)
+        return json.loads(frame.decode('utf-8'))
@@ -0,0 +1,103 @@
+import hashlib
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+from config.settings import settings
+from core.urls import dedup_key
+
+
+class JinaCache:
+    """
+    Jina Reader 响应的本地磁盘缓存 (SQLite)
+    - 键: 规范化 URL (core.urls.dedup_key) 的 sha1，值: zlib 压缩后的 Markdown
+    - TTL 过期、总大小上限，超限时按最近访问时间 (LRU) 淘汰
+    - 离线模式下忽略 TTL，只读缓存，方便复现实验
+    """
+    def __init__(self, path: Path = None, ttl_hours: float = None, max_mb: float = None):
+        self.path = path or settings.JINA_CACHE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = (settings.JINA_CACHE_TTL_HOURS if ttl_hours is None else ttl_hours) * 3600
+        self.max_bytes = int((settings.JINA_CACHE_MAX_MB if max_mb is None else max_mb) * 1024 * 1024)
+        self.offline = settings.JINA_OFFLINE
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jina_cache (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jina_accessed ON jina_cache(accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM jina_cache").fetchone()[0]
+        self.stats = {'hit': 0, 'miss': 0, 'evicted': 0}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(dedup_key(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[str]:
+        key = self._key(url)
+        row = self.conn.execute(
+            "SELECT data, size, created_at FROM jina_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None:
+            self.stats['miss'] += 1
+            return None
+        data, size, created_at = row
+        if not self.offline and self.ttl > 0 and now - created_at > self.ttl:
+            # 过期：删掉，当作未命中
+            self.conn.execute("DELETE FROM jina_cache WHERE key = ?", (key,))
+            self.conn.commit()
+            self.total_bytes -= size
+            self.stats['miss'] += 1
+            return None
+        self.conn.execute("UPDATE jina_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self.conn.commit()
+        self.stats['hit'] += 1
+        return zlib.decompress(data).decode('utf-8')
+
+    def put(self, url: str, markdown: str):
+        key = self._key(url)
+        data = zlib.compress(markdown.encode('utf-8'), 6)
+        now = time.time()
+        old = self.conn.execute("SELECT size FROM jina_cache WHERE key = ?", (key,)).fetchone()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO jina_cache (key, url, data, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (key, url, data, len(data), now, now),
+        )
+        self.total_bytes += len(data) - (old[0] if old else 0)
+        if self.max_bytes > 0 and self.total_bytes > self.max_bytes:
+            self._evict()
+        self.conn.commit()
+
+    def _evict(self):
+        """
+        LRU 淘汰：从最久未访问的开始删，直到低于上限的 90%
+        """
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        rows = self.conn.execute("SELECT key, size FROM jina_cache ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if self.total_bytes <= target:
+                break
+            self.conn.execute("DELETE FROM jina_cache WHERE key = ?", (key,))
+            self.total_bytes -= size
+            evicted += 1
+        self.stats['evicted'] += evicted
+        logger.debug(f"Jina cache evicted {evicted} entries, size now {self.total_bytes / 1e6:.1f} MB")
+
+    def close(self):
+        self.conn.close()
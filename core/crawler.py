@@ -1,11 +1,16 @@
 import aiohttp
 import asyncio
-import json
 from typing import Optional, List, Union
+from urllib.parse import urlparse
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from loguru import logger
 from config.settings import settings
 from core.schema import NewsPayload
+from core.cache import JinaCache
+from core.extractor import html_to_markdown
+from core.ratelimit import host_limiter
+from core.parsers import get_parser
+from core.poller import CursorPoller
 
 class AsyncCrawler:
     """
@@ -17,11 +22,45 @@ class AsyncCrawler:
         self.headers = {
             "User-Agent": "FinNewsMasterV1/1.0 (Quant Research; SJTU Physics)"
         }
+        # 本地抽取直连原站，用浏览器 UA 避免被当成爬虫拦截
+        self.browser_headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        }
+        # 长连接会话：复用 TCP/TLS 连接池和 DNS 缓存，由 start/close 管理生命周期
+        self.session: Optional[aiohttp.ClientSession] = None
+        # 快讯接口增量游标
+        self.poller = CursorPoller()
+        # Jina 响应本地缓存 (重复 URL 直接本地命中；离线模式只读缓存)
+        self.cache = JinaCache() if settings.JINA_CACHE_ENABLED or settings.JINA_OFFLINE else None
+
+    async def start(self) -> aiohttp.ClientSession:
+        """
+        创建共享会话 (重复调用无副作用)
+        """
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.CRAWLER_POOL_SIZE,
+                limit_per_host=settings.CRAWLER_LIMIT_PER_HOST,
+                ttl_dns_cache=settings.CRAWLER_DNS_CACHE_TTL,
+                keepalive_timeout=settings.CRAWLER_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        if self.cache:
+            self.cache.close()
+            self.cache = None
 
     def _is_json_api(self, url: str) -> bool:
         """
         判断是否为JSON API (而非普通网页)
         """
+        if get_parser(url) is not None:
+            return True
         json_indicators = [
             'api.eastmoney.com',
             'newsapi.eastmoney.com',
@@ -34,66 +73,31 @@ class AsyncCrawler:
 
     async def fetch_json_api(self, session: aiohttp.ClientSession, url: str) -> List[NewsPayload]:
         """
-        直接解析JSON API返回的快讯数据
+        直接解析JSON API返回的快讯数据 (按 host 分发到注册的解析器)
         返回 NewsPayload 列表
         """
-        news_list = []
-        async with self.semaphore:
-            try:
+        parser = get_parser(url)
+        if parser is None:
+            logger.warning(f"No JSON parser registered for {url[:50]}...")
+            return []
+
+        async def fetch_text(page_url: str) -> str:
+            await host_limiter.acquire(page_url)
+            async with self.semaphore:
                 # API 通常响应快，不需要太长 timeout
-                async with session.get(url, headers=self.headers, timeout=15) as response:
+                async with session.get(page_url, headers=self.headers, timeout=15) as response:
                     response.raise_for_status()
-                    text = await response.text()
-                    
-                    # 东方财富的数据可能包裹在 var ajaxResult={...} 中
-                    if 'var ajaxResult=' in text:
-                        json_str = text.split('var ajaxResult=')[1].strip()
-                        if json_str.endswith(';'):
-                            json_str = json_str[:-1]
-                    else:
-                        json_str = text
-                    
-                    try:
-                        data = json.loads(json_str)
-                    except json.JSONDecodeError:
-                        # 尝试只截取 {} 部分
-                        start = text.find('{')
-                        end = text.rfind('}') + 1
-                        if start != -1 and end != -1:
-                            data = json.loads(text[start:end])
-                        else:
-                            raise
-
-                    # 1. 解析东方财富快讯格式
-                    if 'LivesList' in data:
-                        items = data['LivesList']
-                        for item in items:
-                            payload = NewsPayload(
-                                url=item.get('url_unique', url), # 如果没有独立URL，就用API URL作为占位，或者构造一个唯一ID
-                                title=item.get('simtitle', item.get('title', 'Unknown')),
-                                content=item.get('digest', item.get('simdigest', '')),
-                                source='EastMoney_API'
-                            )
-                            news_list.append(payload)
-                            
-                    # 2. 解析新浪财经 7x24 格式
-                    elif 'result' in data and 'data' in data['result']:
-                         items = data['result']['data']['feed']['list']
-                         for item in items:
-                             payload = NewsPayload(
-                                 url=item.get('docurl', url),
-                                 title=item.get('rich_text', item.get('plain_text', 'Unknown'))[:50], # 新浪快讯往往没有标题，截取内容前段
-                                 content=item.get('rich_text', item.get('plain_text', '')),
-                                 source='Sina_API'
-                             )
-                             news_list.append(payload)
-
-                    logger.info(f"📦 Parsed {len(news_list)} news items from JSON API: {url[:30]}...")
-                    return news_list
-                    
-            except Exception as e:
-                logger.error(f"JSON API parse error for {url}: {e}")
-                return []
+                    return await response.text()
+
+        try:
+            # 增量轮询：只返回比上次游标更新的快讯
+            news_list = await self.poller.poll(url, parser, fetch_text)
+            logger.info(f"📦 Parsed {len(news_list)} new items from JSON API [{parser.name}]: {url[:30]}...")
+            return news_list
+                
+        except Exception as e:
+            logger.error(f"JSON API parse error for {url}: {e}")
+            return []
 
     @retry(
         stop=stop_after_attempt(3),
@@ -102,36 +106,116 @@ class AsyncCrawler:
     )
     async def fetch_jina_markdown(self, session: aiohttp.ClientSession, url: str) -> str:
         target_url = f"{settings.JINA_READER_BASE}{url}"
+        await host_limiter.acquire(target_url)
         async with self.semaphore:
             # 修改点：timeout 从 15 改成 30
             async with session.get(target_url, headers=self.headers, timeout=30) as response:
                 response.raise_for_status()
                 return await response.text()
 
-    async def process_url(self, url: str) -> Union[NewsPayload, List[NewsPayload], None]:
+    async def fetch_local_markdown(self, session: aiohttp.ClientSession, url: str) -> str:
         """
-        单一 URL 处理流程 - 自动识别JSON/HTML
+        本地抽取后端：直接抓原网页，在进程内做 Readability 风格的正文抽取
+        省掉 Jina 这一跳和它的限流
+        """
+        await host_limiter.acquire(url)
+        async with self.semaphore:
+            async with session.get(url, headers=self.browser_headers, timeout=15) as response:
+                response.raise_for_status()
+                html = await response.text(errors='replace')
+        # 解析是 CPU 密集操作，放到线程里避免卡住事件循环
+        return await asyncio.to_thread(html_to_markdown, html)
+
+    def _backend_for(self, url: str) -> str:
+        """
+        按域名选择抽取后端：LOCAL_EXTRACT_HOSTS 中的域名总是本地抽取，其余按 CRAWLER_BACKEND
         """
-        async with aiohttp.ClientSession() as session:
+        host = urlparse(url).netloc.lower()
+        if any(host == h or host.endswith("." + h) for h in settings.LOCAL_EXTRACT_HOSTS):
+            return "local"
+        return settings.CRAWLER_BACKEND
+
+    async def fetch_markdown(self, session: aiohttp.ClientSession, url: str) -> str:
+        """
+        按后端抓取正文:
+        - jina: 只走 Jina Reader
+        - local: 只走本地抽取
+        - auto: 先走 Jina，超过 JINA_SOFT_TIMEOUT 秒或失败时改走本地抽取
+        """
+        backend = self._backend_for(url)
+        if backend == "local":
+            return await self.fetch_local_markdown(session, url)
+        if backend == "auto":
             try:
-                # 1. 如果是JSON API,直接解析
-                if self._is_json_api(url):
-                    logger.info(f"🔍 Detected JSON API: {url[:50]}...")
-                    return await self.fetch_json_api(session, url)
-
-                # 2. 否则走Jina Reader (普通网页)
-                logger.info(f"Downloading signal: {url}")
-                content = await self.fetch_jina_markdown(session, url)
-                
-                # 简单提取标题 (Jina 返回的 Markdown 第一行通常是标题)
-                lines = content.split('\n')
-                title = lines[0].strip('# ').strip() if lines else "Unknown Title"
-                
-                return NewsPayload(
-                    url=url,
-                    title=title,
-                    content=content
+                return await asyncio.wait_for(
+                    self.fetch_jina_markdown(session, url), timeout=settings.JINA_SOFT_TIMEOUT
                 )
             except Exception as e:
-                logger.error(f"Signal Loss for {url}: {e}")
+                logger.info(f"🔁 Jina slow or failed ({type(e).__name__}), local extraction: {url}")
+                return await self.fetch_local_markdown(session, url)
+        return await self.fetch_jina_markdown(session, url)
+
+    async def get_markdown(self, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+        """
+        先查本地缓存，未命中再按后端抓取；离线模式下未命中直接返回 None
+        """
+        if self.cache:
+            content = self.cache.get(url)
+            if content is not None:
+                logger.debug(f"💾 Jina cache hit: {url}")
+                return content
+        if settings.JINA_OFFLINE:
+            logger.warning(f"Offline mode, no cached copy for {url}")
+            return None
+
+        content = await self.fetch_markdown(session, url)
+        if self.cache and content:
+            self.cache.put(url, content)
+        return content
+
+    async def hydrate(self, news: NewsPayload) -> bool:
+        """
+        给只有标题的条目补上全文 (标题优先流程中，快通道判为相关后才调用)
+        """
+        session = await self.start()
+        try:
+            logger.info(f"Hydrating signal: {news.url}")
+            content = await self.get_markdown(session, news.url)
+        except Exception as e:
+            logger.error(f"Signal Loss for {news.url}: {e}")
+            return False
+        if content is None:
+            return False
+        news.content = content
+        return True
+
+    async def process_url(self, url: str) -> Union[NewsPayload, List[NewsPayload], None]:
+        """
+        单一 URL 处理流程 - 自动识别JSON/HTML
+        """
+        session = await self.start()
+        try:
+            # 1. 如果是JSON API,直接解析
+            if self._is_json_api(url):
+                logger.info(f"🔍 Detected JSON API: {url[:50]}...")
+                return await self.fetch_json_api(session, url)
+
+            # 2. 否则走Jina Reader (普通网页)
+            logger.info(f"Downloading signal: {url}")
+            content = await self.get_markdown(session, url)
+            if content is None:
                 return None
+            
+            # 简单提取标题 (Jina 返回的 Markdown 第一行通常是标题)
+            lines = content.split('\n')
+            title = lines[0].strip('# ').strip() if lines else "Unknown Title"
+            
+            return NewsPayload(
+                url=url,
+                title=title,
+                content=content,
+                source=urlparse(url).netloc or "Unknown"
+            )
+        except Exception as e:
+            logger.error(f"Signal Loss for {url}: {e}")
+            return None
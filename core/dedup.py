@@ -0,0 +1,190 @@
+import hashlib
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from loguru import logger
+from config.settings import settings
+from core.urls import dedup_key
+
+
+def fingerprint(url: str) -> int:
+    """
+    URL 的 64 位指纹 (有符号，可直接作为 SQLite INTEGER 主键)
+    先规范化，同一篇文章的不同写法得到同一个指纹
+    """
+    digest = hashlib.blake2b(dedup_key(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class BloomFilter:
+    """
+    定长布隆过滤器：只用来快速判定"一定没见过"，命中后仍需查持久层确认
+    k 个哈希位由 64 位指纹做双重哈希得到，不再重复计算摘要
+    """
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(1, capacity)
+        self.size = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, fp: int):
+        fp &= (1 << 64) - 1
+        h1, h2 = fp & 0xFFFFFFFF, (fp >> 32) | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, fp: int):
+        for pos in self._positions(fp):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, fp: int) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(fp))
+
+    def clear(self):
+        self.bits = bytearray(len(self.bits))
+
+
+class SeenStore:
+    """
+    雷达去重集合 (替代无限增长的 set)，接口与 set 的 add / discard / in / update 保持一致
+    三级结构：
+      - 布隆过滤器 (定长内存)：绝大多数新 URL 在这里直接判定为未见过
+      - 热点缓存 (LRU，定长)：最近见过的指纹，省去重复查库
+      - SQLite 持久层：只存 64 位指纹 + 最近出现时间，重启后依然有效
+    超过时间窗口 (DEDUP_WINDOW_HOURS) 未再出现的指纹会被清理，内存和磁盘占用都不随运行时间增长
+    add() 只在内存中登记 (待定)，流水线处理完 (settle) 才写入 SQLite：
+    崩溃时还没处理完的 URL 不会落盘，重启后会被重新发现，而不是永久丢失
+    """
+    def __init__(self, path: Path = None, window_hours: float = None, hot_size: int = None):
+        self.path = path or settings.DEDUP_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.window = (settings.DEDUP_WINDOW_HOURS if window_hours is None else window_hours) * 3600
+        self.hot_size = settings.DEDUP_HOT_SIZE if hot_size is None else hot_size
+        self.hot: "OrderedDict[int, float]" = OrderedDict()
+        # 已发现、尚未处理完的指纹 -> 发现时间 (数量只随在途条目增长)
+        self.pending: Dict[int, float] = {}
+        self.bloom: Optional[BloomFilter] = None
+        if settings.DEDUP_BLOOM_ENABLED:
+            self.bloom = BloomFilter(settings.DEDUP_BLOOM_CAPACITY, settings.DEDUP_BLOOM_ERROR_RATE)
+
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen (fp INTEGER PRIMARY KEY, seen_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_at ON seen(seen_at)")
+        self.conn.commit()
+        self.last_prune = 0.0
+        self.prune()
+
+    # ---------- set 兼容接口 ----------
+
+    def __contains__(self, url: str) -> bool:
+        fp = fingerprint(url)
+        if self.bloom is not None and fp not in self.bloom:
+            return False
+        if fp in self.pending:
+            return True
+        now = time.time()
+        seen_at = self.hot.get(fp)
+        if seen_at is None:
+            row = self.conn.execute("SELECT seen_at FROM seen WHERE fp = ?", (fp,)).fetchone()
+            if row is None:
+                return False
+            seen_at = row[0]
+        if self.window > 0 and now - seen_at > self.window:
+            return False
+        # 仍在源里反复出现的 URL 顺延有效期 (过了半个窗口才写库，避免每次命中都写)
+        if self.window > 0 and now - seen_at > self.window / 2:
+            self.conn.execute("UPDATE seen SET seen_at = ? WHERE fp = ?", (now, fp))
+            seen_at = now
+        self._remember(fp, seen_at)
+        return True
+
+    def add(self, url: str):
+        """
+        登记新发现的 URL (待定，settle 后才落盘)
+        """
+        fp = fingerprint(url)
+        self.pending[fp] = time.time()
+        if self.bloom is not None:
+            self.bloom.add(fp)
+
+    def settle(self, url: str):
+        """
+        流水线处理完一条 (无论结果如何) 后调用，待定记录写入持久层；不是雷达登记的 URL 直接忽略
+        """
+        fp = fingerprint(url)
+        seen_at = self.pending.pop(fp, None)
+        if seen_at is None:
+            return
+        self.conn.execute("INSERT OR REPLACE INTO seen (fp, seen_at) VALUES (?, ?)", (fp, seen_at))
+        self._remember(fp, seen_at)
+
+    def update(self, urls: Iterable[str]):
+        """
+        批量登记 (例如重启时用持久化队列的 URL 预热)，已存在的保留原时间
+        """
+        now = time.time()
+        fps = [fingerprint(u) for u in urls]
+        self.conn.executemany("INSERT OR IGNORE INTO seen (fp, seen_at) VALUES (?, ?)", [(fp, now) for fp in fps])
+        if self.bloom is not None:
+            for fp in fps:
+                self.bloom.add(fp)
+        self.conn.commit()
+
+    def discard(self, url: str):
+        """
+        移除 (布隆过滤器无法删除，只会多一次查库)
+        """
+        fp = fingerprint(url)
+        self.conn.execute("DELETE FROM seen WHERE fp = ?", (fp,))
+        self.hot.pop(fp, None)
+        self.pending.pop(fp, None)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    # ---------- 维护 ----------
+
+    def _remember(self, fp: int, seen_at: float):
+        self.hot[fp] = seen_at
+        self.hot.move_to_end(fp)
+        if len(self.hot) > self.hot_size:
+            self.hot.popitem(last=False)
+
+    def flush(self):
+        """
+        提交本轮写入；每小时顺带清理一次过期指纹
+        """
+        self.conn.commit()
+        if time.time() - self.last_prune > 3600:
+            self.prune()
+
+    def prune(self):
+        """
+        删除窗口外的指纹，并用剩余指纹重建布隆过滤器 (布隆过滤器不支持删除)
+        """
+        now = time.time()
+        self.last_prune = now
+        if self.window > 0:
+            cur = self.conn.execute("DELETE FROM seen WHERE seen_at < ?", (now - self.window,))
+            if cur.rowcount:
+                logger.info(f"🧹 Expired {cur.rowcount} fingerprints from dedup store")
+            self.hot = OrderedDict((fp, t) for fp, t in self.hot.items() if now - t <= self.window)
+            # 一直没有结果的待定记录 (例如处理中出错) 也放掉，让源上仍在的 URL 能被重新发现
+            self.pending = {fp: t for fp, t in self.pending.items() if now - t <= self.window}
+        self.conn.commit()
+        if self.bloom is not None:
+            self.bloom.clear()
+            for (fp,) in self.conn.execute("SELECT fp FROM seen"):
+                self.bloom.add(fp)
+            for fp in self.pending:
+                self.bloom.add(fp)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
@@ -8,6 +8,18 @@ from typing import Optional, List
 from loguru import logger
 from config.settings import settings
 from core.schema import NewsPayload, SignalAnalysis
+from core.trace import mark
+
+# 快通道旁路关键词：标题命中即视为相关 (优先级队列也用它来提权)
+BYPASS_KEYWORDS = ["A股", "股市", "人民币", "央行", "美联储", "利好", "利空", "GDP", "CPI", "监管",
+"芯片", "半导体", "财报", "增持", "回购", "AI", "金融", "算力",
+"沪指", "板块", "概念股", "股票", "涨停", "跌停", "回调", "反弹", "市场情绪",
+"融资", "证券", "大盘", "指数", "成交额", "北向", "外资", "特斯拉", "宁德时代"
+]
+
+
+def keyword_hit(title: str) -> bool:
+    return any(k in title for k in BYPASS_KEYWORDS)
 
 
 class LLMEngine:
@@ -18,6 +30,34 @@ class LLMEngine:
     def __init__(self):
         limit = 50 if settings.LLM_PROVIDER == "deepseek" else settings.MAX_GPU_CONCURRENCY
         self.concurrency_lock = asyncio.Semaphore(limit)
+        # 每个后端一个长连接会话 (keep-alive)，避免每次推理都重新建连
+        self.sessions: dict[str, aiohttp.ClientSession] = {}
+
+    def _get_session(self, provider: str) -> aiohttp.ClientSession:
+        session = self.sessions.get(provider)
+        if session is None or session.closed:
+            limit = 50 if provider == "deepseek" else max(1, settings.MAX_GPU_CONCURRENCY)
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                keepalive_timeout=settings.LLM_KEEPALIVE_TIMEOUT,
+            )
+            read_timeout = settings.DEEPSEEK_READ_TIMEOUT if provider == "deepseek" else settings.OLLAMA_READ_TIMEOUT
+            timeout = aiohttp.ClientTimeout(
+                connect=settings.LLM_CONNECT_TIMEOUT,
+                sock_read=read_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self.sessions[provider] = session
+        return session
+
+    async def close(self):
+        """
+        关闭所有后端会话 (进程退出前调用)
+        """
+        for session in self.sessions.values():
+            if not session.closed:
+                await session.close()
+        self.sessions = {}
 
     async def _get_gpu_temperature(self) -> Optional[int]:
         def runner() -> Optional[int]:
@@ -82,18 +122,18 @@ class LLMEngine:
             "max_tokens": max_tokens,
             "stream": False,
         }
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, headers=headers, json=payload, timeout=120) as resp:
-                    if resp.status != 200:
-                        error_text = await resp.text()
-                        logger.error(f"[DeepSeek] Error {resp.status}: {error_text}")
-                        return ""
-                    data = await resp.json()
-                    return data["choices"][0]["message"]["content"]
-            except Exception as e:
-                logger.error(f"[DeepSeek] Connection Failed: {e}")
-                return ""
+        session = self._get_session("deepseek")
+        try:
+            async with session.post(url, headers=headers, json=payload) as resp:
+                if resp.status != 200:
+                    error_text = await resp.text()
+                    logger.error(f"[DeepSeek] Error {resp.status}: {error_text}")
+                    return ""
+                data = await resp.json()
+                return data["choices"][0]["message"]["content"]
+        except Exception as e:
+            logger.error(f"[DeepSeek] Connection Failed: {e}")
+            return ""
 
     async def _call_ollama(self, prompt: str, temp: float, max_tokens: int) -> str:
         """
@@ -111,15 +151,15 @@ class LLMEngine:
             },
         }
         await self._wait_for_safe_temperature()
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(url, json=payload, timeout=60) as resp:
-                    resp.raise_for_status()
-                    data = await resp.json()
-                    return data.get("response", "")
-            except Exception as e:
-                logger.error(f"[Ollama] Error: {e}")
-                return ""
+        session = self._get_session("ollama")
+        try:
+            async with session.post(url, json=payload) as resp:
+                resp.raise_for_status()
+                data = await resp.json()
+                return data.get("response", "")
+        except Exception as e:
+            logger.error(f"[Ollama] Error: {e}")
+            return ""
 
     async def call_model(self, prompt: str, temp: float, max_tokens: int = 2048) -> str:
         """
@@ -137,12 +177,7 @@ class LLMEngine:
         """
         # 1. 极简规则：如果标题包含特定硬关键词，直接通过（旁路机制）
         # 物理直觉：有些信号太明显，不需要过模型
-        keywords = ["A股", "股市", "人民币", "央行", "美联储", "利好", "利空", "GDP", "CPI", "监管"
-        "芯片", "半导体", "财报", "增持", "回购", "AI", "金融", "算力", "半导体",
-        "沪指", "板块", "概念股", "股票", "涨停", "跌停", "回调", "反弹", "市场情绪",
-        "融资", "证券", "大盘", "指数", "成交额", "北向", "外资", "特斯拉", "宁德时代"
-        ]
-        if any(k in news.title for k in keywords):
+        if keyword_hit(news.title):
             logger.info(f"⚡ [Fast Path] Keyword Bypass | {news.title[:60]}...")
             return True
 
@@ -321,6 +356,13 @@ class LLMEngine:
             return 0.7
         return 0.95
 
+    async def cheap_analyze(self, news: NewsPayload) -> Optional[SignalAnalysis]:
+        """
+        廉价通道：单次分析，不做 Ensemble 和对抗验证
+        用于排队超时的积压新闻，保住时效性
+        """
+        return await self._single_analyze(news, settings.TEMP_SLOW)
+
     async def slow_path_analyze(self, news: NewsPayload) -> Optional[SignalAnalysis]:
         """
         慢通道：深度思维链分析 (System 2 Reasoning)
@@ -328,6 +370,7 @@ class LLMEngine:
         """
         # 1. Ensemble Analysis
         analysis = await self.ensemble_analyze(news)
+        mark(news, "ensemble_end")
         if not analysis:
             return None
             
@@ -343,5 +386,6 @@ class LLMEngine:
              
              if analysis.certainty != original_certainty:
                  logger.info(f"📉 Certainty adjusted from {original_certainty} to {analysis.certainty} after adversarial check.")
+             mark(news, "adversarial_end")
 
         return analysis
@@ -0,0 +1,178 @@
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# 整块丢弃的标签 (内容不参与正文)
+SKIP_TAGS = {"script", "style", "noscript", "iframe", "svg", "nav", "footer", "header", "aside", "form", "button", "select"}
+# 容器标签：正文段落按所在容器累计得分
+CONTAINER_TAGS = {"div", "article", "section", "main", "td", "body"}
+# 块级文本标签：对应 Markdown 的一个段落
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote"}
+VOID_TAGS = {"br", "img", "meta", "link", "input", "hr", "source", "area", "base", "col", "embed", "wbr"}
+
+POSITIVE_HINTS = re.compile(r"article|content|post|main|text|body|detail|news", re.I)
+NEGATIVE_HINTS = re.compile(r"comment|footer|sidebar|side|nav|menu|ad[s_-]|banner|share|recommend|related|copyright", re.I)
+
+
+class _ReadabilityParser(HTMLParser):
+    """
+    单遍扫描 HTML：记录每个文本块及其所在的容器链，同时给容器打分
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.og_title = ""
+        self.stack: List[str] = []
+        # 当前打开的容器 id 链；0 是文档根容器，兼容没有 <body> 的页面片段
+        self.containers: List[int] = [0]
+        self.container_bonus: Dict[int, float] = {0: 0.0}
+        self.parent: Dict[int, Optional[int]] = {0: None}
+        self.blocks: List[Tuple[Tuple[int, ...], str, str]] = []  # (容器链, 标签, 文本)
+        self._next_id = 1
+        self._skip_depth = 0
+        self._in_title = False
+        self._block_tag: Optional[str] = None
+        self._buf: List[str] = []
+
+    # ---------- 解析回调 ----------
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta" and attrs.get("property") == "og:title":
+            self.og_title = attrs.get("content") or ""
+        if tag in VOID_TAGS:
+            if tag == "br" and self._block_tag:
+                self._buf.append("\n")
+            return
+        self.stack.append(tag)
+        if self._skip_depth or tag in SKIP_TAGS:
+            self._skip_depth += 1
+            return
+        if tag == "title":
+            self._in_title = True
+        if tag in CONTAINER_TAGS:
+            self._flush_block()
+            cid = self._next_id
+            self._next_id += 1
+            self.parent[cid] = self.containers[-1] if self.containers else None
+            hint = f"{attrs.get('class') or ''} {attrs.get('id') or ''}"
+            bonus = 0.0
+            if tag in ("article", "main"):
+                bonus += 50
+            if POSITIVE_HINTS.search(hint):
+                bonus += 25
+            if NEGATIVE_HINTS.search(hint):
+                bonus -= 50
+            self.container_bonus[cid] = bonus
+            self.containers.append(cid)
+        elif tag in BLOCK_TAGS and self._block_tag is None:
+            self._flush_block()
+            self._block_tag = tag
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or tag not in self.stack:
+            return
+        # 容错：把未闭合的内层标签一并弹出
+        while self.stack:
+            open_tag = self.stack.pop()
+            self._close(open_tag)
+            if open_tag == tag:
+                break
+
+    def _close(self, tag):
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        if tag == "title":
+            self._in_title = False
+        if tag == self._block_tag:
+            self._flush_block()
+        elif tag in CONTAINER_TAGS and self.containers:
+            self._flush_block()
+            self.containers.pop()
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        if self._in_title:
+            self.title += data
+            return
+        if self.containers:
+            self._buf.append(data)
+
+    def _flush_block(self):
+        text = re.sub(r"[ \t\r\f\v]+", " ", "".join(self._buf))
+        text = "\n".join(line.strip() for line in text.split("\n") if line.strip())
+        if text and self.containers:
+            self.blocks.append((tuple(self.containers), self._block_tag or "p", text))
+        self._buf = []
+        self._block_tag = None
+
+    # ---------- 打分 ----------
+
+    def best_container(self) -> Optional[int]:
+        scores: Dict[int, float] = dict(self.container_bonus)
+        for chain, tag, text in self.blocks:
+            if tag != "p" or len(text) < 25:
+                continue
+            # 段落越长、标点越多越像正文 (中英文逗号句号都算)
+            score = 1 + len(re.findall(r"[，。,；;]", text)) + min(len(text) / 100, 3)
+            owner = chain[-1]
+            scores[owner] = scores.get(owner, 0) + score
+            grand = self.parent.get(owner)
+            if grand is not None:
+                scores[grand] = scores.get(grand, 0) + score / 2
+        # 只在有段落得分的容器里挑
+        candidates = {cid: s for cid, s in scores.items()
+                      if any(cid in chain for chain, _, _ in self.blocks)}
+        if not candidates:
+            return None
+        return max(candidates, key=candidates.get)
+
+
+def html_to_text(fragment: str) -> str:
+    """
+    HTML 片段 (如 RSS 摘要) 转纯文本：段落/换行保留为空行，其余标签直接去掉
+    """
+    text = re.sub(r"(?is)<(script|style)\b.*?</\1>", "", fragment or "")
+    text = re.sub(r"(?i)<br\s*/?>|</(p|div|li|h[1-6])>", "\n", text)
+    text = unescape(re.sub(r"<[^>]+>", "", text))
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in text.split("\n"))
+    return "\n\n".join(line for line in lines if line)
+
+
+def html_to_markdown(html: str) -> str:
+    """
+    Readability 风格的正文抽取：找到得分最高的容器，把其中的文本块转成 Markdown
+    第一行固定为 "# 标题"，与 Jina Reader 的输出格式保持一致
+    """
+    parser = _ReadabilityParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # HTMLParser 对极端畸形的页面可能报错，已解析的部分照常使用
+        pass
+    parser._flush_block()
+
+    best = parser.best_container()
+    lines = []
+    for chain, tag, text in parser.blocks:
+        if best is not None and best not in chain:
+            continue
+        if tag.startswith("h") and tag[1:].isdigit():
+            lines.append(f"{'#' * int(tag[1:])} {text}")
+        elif tag == "li":
+            lines.append(f"- {text}")
+        elif tag == "blockquote":
+            lines.append("> " + text.replace("\n", "\n> "))
+        elif tag == "pre":
+            lines.append(f"```\n{text}\n```")
+        else:
+            lines.append(text)
+
+    title = unescape((parser.og_title or parser.title).strip())
+    if not title:
+        title = next((text for _, tag, text in parser.blocks if tag == "h1"), "Unknown Title")
+    return f"# {title}\n\n" + "\n\n".join(lines)
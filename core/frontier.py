@@ -0,0 +1,59 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from datetime import datetime
+from typing import Optional
+from config.settings import settings
+from core.engine import keyword_hit
+from core.schema import NewsPayload
+
+
+def news_priority_boost(news: NewsPayload) -> float:
+    """
+    计算一条新闻的提权量 (单位: 秒，相当于"插队"多少秒)
+    = 来源优先级 + 关键词命中 + 新鲜度
+    """
+    boost = 0.0
+
+    # 1. 来源优先级 (按子串匹配 source，取最大值)
+    source = news.source or ""
+    matched = [v for k, v in settings.SOURCE_PRIORITY.items() if k in source]
+    if matched:
+        boost += max(matched)
+
+    # 2. 快通道关键词命中：大概率是市场相关的硬信号
+    if news.title and keyword_hit(news.title):
+        boost += settings.KEYWORD_PRIORITY_BOOST
+
+    # 3. 新鲜度：越新的新闻提权越多，超过 RECENCY_WINDOW 后为 0
+    window = settings.RECENCY_WINDOW_SECONDS
+    if window > 0:
+        age = max(0.0, (datetime.now() - news.fetched_at).total_seconds())
+        boost += settings.RECENCY_PRIORITY_BOOST * max(0.0, 1 - age / window)
+
+    return boost
+
+
+class PriorityNewsQueue(asyncio.Queue):
+    """
+    新闻优先级队列 (接口与 asyncio.Queue 完全一致，可直接替换)
+    排序键 = 入队时刻 - 提权量，键越小越先出队
+    老化机制是自带的：新来的条目入队时刻更晚，提权再高也只能插队有限的秒数，
+    所以低优先级条目最多多等 max(提权量) 秒，不会饿死
+    哨兵 None 的键为 +inf，保证排在所有数据之后
+    """
+    def _init(self, maxsize):
+        self._queue = []
+        self._counter = itertools.count()
+
+    def _put(self, item: Optional[NewsPayload]):
+        if item is None:
+            rank = math.inf
+        else:
+            rank = time.monotonic() - news_priority_boost(item)
+        heapq.heappush(self._queue, (rank, next(self._counter), item))
+
+    def _get(self):
+        return heapq.heappop(self._queue)[2]
@@ -2,28 +2,48 @@ import aiohttp
 import asyncio
 import feedparser
 import time
-import json
-from typing import List, Set
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Callable, Tuple, Union
+from urllib.parse import urlparse
 from loguru import logger
+from config.settings import settings
+from core.crawler import AsyncCrawler
+from core.extractor import html_to_text
+from core.dedup import SeenStore
+from core.ratelimit import host_limiter
+from core.scheduler import PollScheduler
+from core.schema import NewsPayload
+from core.trace import mark
 
 class NewsMonitor:
     """
     雷达模块 v5: 增加直接API抓取 + 统计功能
     """
-    def __init__(self):
-        self.seen_urls: Set[str] = set()
+    def __init__(self, crawler: AsyncCrawler = None):
+        # 与 Pipeline 共用同一个爬虫：会话连接池、JSON 解析器、增量游标都只有一份
+        self.crawler = crawler or AsyncCrawler()
+        # 去重集合：指纹 + 布隆过滤器 + SQLite 持久层，内存恒定，重启后不会重新灌入存量
+        self.seen_urls = SeenStore()
+        # frontier 满时暂存的快讯 (不能像 URL 那样等下一轮重新发现)
+        self.deferred: List[NewsPayload] = []
+        # 每个 RSS 源上次响应的 ETag / Last-Modified，用于条件请求
+        self.feed_validators: Dict[str, Dict[str, Optional[str]]] = {}
         self.stats = {
             'total_scanned': 0,
             'new_urls': 0,
+            'api_items': 0,
             'rss_success': 0,
-            'rss_failed': 0
+            'rss_failed': 0,
+            'rss_not_modified': 0,
+            'rss_rich': 0,
+            'rss_title_only': 0
         }
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
         
         # ===== 新增: 直接API源 ===== 
-        # 这些返回JSON,不经过RSS, 直接作为URL交给Crawler的JSON解析器处理
+        # 这些返回JSON,不经过RSS, 由雷达直接用Crawler的JSON解析器拉取内容
         self.api_sources = [
             # 东方财富快讯 (每次返回50条)
             "https://newsapi.eastmoney.com/kuaixun/v1/getlist_102_ajaxResult_50_1_.html",
@@ -69,21 +89,104 @@ class NewsMonitor:
             "https://rsshub.app/wallstreetcn/news/global" 
         ]
 
-    async def scan_rss_feed(self, url: str) -> List[str]:
+        # 每个源独立的轮询节拍；关闭自适应时所有源都固定为 SCAN_INTERVAL
+        if settings.ADAPTIVE_POLLING:
+            self.scheduler = PollScheduler(self.api_sources + self.rss_sources)
+        else:
+            self.scheduler = PollScheduler(
+                self.api_sources + self.rss_sources,
+                min_interval=settings.SCAN_INTERVAL, max_interval=settings.SCAN_INTERVAL,
+            )
+
+    async def fetch_feed(self, url: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        """
+        条件请求拉取 RSS：带上次的 ETag / Last-Modified
+        返回 (原始字节, 响应头)；None 表示 304 (源没有更新)，调用方直接跳过解析
+        响应头交给 feedparser：字符集以 Content-Type 为准，相对链接按最终 URL 补全
+        """
+        headers = dict(self.headers)
+        validators = self.feed_validators.get(url, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        session = await self.crawler.start()
+        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as resp:
+            if resp.status == 304:
+                return None
+            resp.raise_for_status()
+            body = await resp.read()
+            # 只有成功拿到完整内容后才更新校验值
+            self.feed_validators[url] = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+            }
+            # feedparser 按小写键查找响应头；没有 Content-Location 时用重定向后的地址作为相对链接的基准
+            response_headers = {k.lower(): v for k, v in resp.headers.items()}
+            response_headers.setdefault("content-location", str(resp.url))
+            return body, response_headers
+
+    def _rss_item(self, entry, link: str) -> Union[str, NewsPayload]:
+        """
+        RSS 条目转成流水线条目：摘要/全文足够长时直接带上内容，省掉一次 Jina 抓取；
+        摘要太短时只带标题 (content 为空)，快通道判为相关后才抓全文；没有标题则只返回 URL
+        """
+        title = (entry.get('title') or "").strip()
+        # content:encoded (全文) 优先，其次 description/summary
+        candidates = [c.get('value', "") for c in entry.get('content') or []]
+        candidates.append(entry.get('summary') or "")
+        text = max((html_to_text(c) for c in candidates), key=len)
+
+        min_chars = settings.RSS_SUMMARY_MIN_CHARS
+        has_summary = min_chars > 0 and len(text) >= min_chars
+        if not title or not (has_summary or settings.TITLE_FIRST_ENABLED):
+            return link
+
+        # feedparser 给出的是 UTC struct_time，转成与 fetched_at 一致的本地时间
+        published_at = None
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        if parsed:
+            published_at = datetime(*parsed[:6], tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        news = NewsPayload(
+            url=link,
+            title=title,
+            content=f"# {title}\n\n{text}" if has_summary else None,
+            source=urlparse(link).netloc or "Unknown",
+            published_at=published_at,
+        )
+        # 条目随 RSS 一起到达，抓取区间记为 0
+        now = time.monotonic()
+        mark(news, "crawl_start", now)
+        mark(news, "crawl_end", now)
+        self.stats['rss_rich' if has_summary else 'rss_title_only'] += 1
+        return news
+
+    async def scan_rss_feed(self, url: str) -> List[Union[str, NewsPayload]]:
         """
         通用 RSS 扫描器
+        返回: 需要抓取全文的 URL，或已带摘要内容的 NewsPayload
         """
         new_links = []
         try:
-            # feedparser 是同步 IO，为了不阻塞主循环，丢到线程池运行
-            feed = await asyncio.to_thread(feedparser.parse, url)
+            await host_limiter.acquire(url)
+            fetched = await self.fetch_feed(url)
+            if fetched is None:
+                self.stats['rss_not_modified'] += 1
+                return new_links
+            body, response_headers = fetched
+            # feedparser 解析是同步 CPU 计算，为了不阻塞主循环，丢到线程池运行
+            feed = await asyncio.to_thread(feedparser.parse, body, response_headers=response_headers)
             
             if hasattr(feed, 'entries'):
                 for entry in feed.entries:
-                    link = entry.link
+                    link = entry.get('link')
                     # 简单过滤：只保留 http 开头的有效链接
-                    if link and link.startswith('http') and link not in self.seen_urls:
-                        new_links.append(link)
+                    if not link or not link.startswith('http'):
+                        continue
+                    # 去重按规范化后的键 (跟踪参数、移动版域名等变体只抓一次)，抓取仍用原始链接
+                    if link not in self.seen_urls:
+                        new_links.append(self._rss_item(entry, link))
                         self.seen_urls.add(link)
                 
                 if new_links:
@@ -96,68 +199,152 @@ class NewsMonitor:
         
         return new_links
 
-    async def scan_api_endpoint(self, session: aiohttp.ClientSession, api_url: str) -> List[str]:
+    async def scan_api_endpoint(self, api_url: str) -> List[NewsPayload]:
         """
         扫描返回JSON的API接口
-        返回的不是URL列表,而是直接把API地址加入队列
-        (因为这些API本身就是数据源)
+        快讯接口本身就是内容：直接用爬虫的解析器 + 增量游标拿到新条目，
+        交给 Pipeline 时不再需要二次抓取 (每个接口每轮只请求一次)
         """
         try:
-            async with session.get(api_url, headers=self.headers, timeout=10) as resp:
-                if resp.status == 200:
-                    # 对于API URL，我们不根据内容去重（因为内容会变），而是总是允许它被处理
-                    # 但是为了防止 pipeline 过于拥堵，可以做一个简单的频率限制或 hash check (这里简化处理，总是返回)
-                    # 实际上，如果 API URL 本身不变，seen_urls 机制会拦截它。
-                    # 所以这里有一个特殊逻辑：API URL 应该被视为“生成器”，而不是“文章”。
-                    # 但是 FinNewsPipeline 的设计是 URL -> Process。
-                    # 为了让 Crawler 每次都去抓新的 JSON，我们需要让 Monitor 每次都把这个 API URL 抛出去吗？
-                    # 不，如果 seen_urls 记录了 api_url，下次就不抓了。
-                    # **修正**: API URL 不应该加入 seen_urls，或者每次加一个时间戳参数让它不同。
-                    
-                    # 策略：Monitor 返回 API URL，Crawler 解析出 NewsItems。
-                    # 我们需要确保 Monitor 每次都能把 API URL 报上去。
-                    return [api_url] 
+            session = await self.crawler.start()
+            crawl_start = time.monotonic()
+            news_list = await self.crawler.fetch_json_api(session, api_url)
+            crawl_end = time.monotonic()
         except Exception as e:
             logger.debug(f"API scan skip: {api_url[:40]}... ({str(e)[:20]})")
-        
-        return []
+            return []
 
-    async def harvest(self) -> List[str]:
+        fresh = []
+        for news in news_list:
+            # 与 RSS 共用去重集合，同一条快讯不会被两个源重复送入
+            # (没有独立链接、用接口地址占位的条目只靠游标增量，不参与 URL 去重)
+            if news.url != api_url:
+                if news.url in self.seen_urls:
+                    continue
+                self.seen_urls.add(news.url)
+            mark(news, "crawl_start", crawl_start)
+            mark(news, "crawl_end", crawl_end)
+            fresh.append(news)
+        self.stats['api_items'] += len(fresh)
+        return fresh
+
+    async def scan_source(self, url: str) -> List[Union[str, NewsPayload]]:
         """
-        全火力扫描 + 统计报告
+        扫描单个源，并把本次的新条目数回报给调度器 (用于估计该源的更新频率)
         """
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            
-            # 1. 启动 API 任务 (直接把 API URL 交给 Crawler 处理)
-            for api_url in self.api_sources:
-                tasks.append(self.scan_api_endpoint(session, api_url))
-            
-            # 2. 启动所有 RSS 任务
-            for rss_url in self.rss_sources:
-                tasks.append(self.scan_rss_feed(rss_url))
-            
-            # 3. 并发等待
-            results = await asyncio.gather(*tasks)
-            
-            # 4. 展平结果
-            all_urls = [u for sub in results for u in sub]
-            
-            # 统计
-            self.stats['total_scanned'] += 1
-            self.stats['new_urls'] += len(all_urls)
-            
-            # 每10次扫描打印统计
-            if self.stats['total_scanned'] % 10 == 0:
-                logger.info(
-                    f"📊 Scan Stats: "
-                    f"Total={self.stats['total_scanned']} | "
-                    f"NewURLs={self.stats['new_urls']} | "
-                    f"RSS_OK={self.stats['rss_success']} | "
-                    f"RSS_Fail={self.stats['rss_failed']}"
-                )
-            
-            if all_urls:
-                logger.info(f"📡 Detected {len(all_urls)} URLs this round")
-            
-            return all_urls
\ No newline at end of file
+        if url in self.api_sources:
+            # API 任务 (直接解析出快讯内容)
+            items = await self.scan_api_endpoint(url)
+        else:
+            # RSS 任务
+            items = await self.scan_rss_feed(url)
+        self.scheduler.observe(url, len(items))
+        self.stats['new_urls'] += sum(1 for item in items if isinstance(item, str))
+        return items
+
+    async def harvest(self, sources: List[str] = None) -> List[Union[str, NewsPayload]]:
+        """
+        全火力扫描 + 统计报告 (sources 为空时扫描全部源)
+        返回: RSS 发现的文章 URL + 快讯接口直接带回的 NewsPayload
+        """
+        if sources is None:
+            sources = self.api_sources + self.rss_sources
+
+        # 并发等待
+        results = await asyncio.gather(*(self.scan_source(url) for url in sources))
+
+        # 展平结果
+        all_items = [u for sub in results for u in sub]
+        self.seen_urls.flush()
+        self._count_round()
+
+        if all_items:
+            logger.info(f"📡 Detected {len(all_items)} items this round")
+
+        return all_items
+
+    def _count_round(self):
+        """
+        统计一轮扫描，每10轮打印一次
+        """
+        self.stats['total_scanned'] += 1
+        if self.stats['total_scanned'] % 10 == 0:
+            logger.info(
+                f"📊 Scan Stats: "
+                f"Total={self.stats['total_scanned']} | "
+                f"NewURLs={self.stats['new_urls']} | "
+                f"APIItems={self.stats['api_items']} | "
+                f"RSS_OK={self.stats['rss_success']} | "
+                f"RSS_Fail={self.stats['rss_failed']} | "
+                f"RSS_304={self.stats['rss_not_modified']} | "
+                f"RSS_Rich={self.stats['rss_rich']} | "
+                f"RSS_TitleOnly={self.stats['rss_title_only']}"
+            )
+            logger.debug(f"⏱️ Poll intervals: {self.scheduler.summary()}")
+
+    def close(self):
+        self.seen_urls.close()
+
+    async def run_forever(self, submit: Callable[[Union[str, NewsPayload]], None]):
+        """
+        常驻雷达：每个源按各自的节拍扫描，把新条目交给 submit (推入 frontier)
+        每个源的扫描是独立任务，慢源 (超时、限流) 只推迟它自己的下一次轮询，不会拖住其他源
+        节拍以计划时间为准 (而非上一次扫描结束时间)，扫描本身不会等待下游
+        """
+        inflight: Dict[str, asyncio.Task] = {}
+        try:
+            while True:
+                for url in [url for url, task in inflight.items() if task.done()]:
+                    del inflight[url]
+
+                # 还在扫描中的源不重复派发
+                due = [url for url in self.scheduler.due() if url not in inflight]
+                if due:
+                    logger.info(f"📡 Scanning {len(due)} sources for new intelligence...")
+                    for url in due:
+                        inflight[url] = asyncio.create_task(self._poll_source(url, submit))
+                    self._count_round()
+
+                # 等到下一个空闲源到期，或任一在途扫描结束 (它的下一次到期时间刚刚更新)
+                timeout = self.scheduler.sleep_time(busy=inflight)
+                if inflight:
+                    await asyncio.wait(list(inflight.values()), timeout=timeout,
+                                       return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    await asyncio.sleep(timeout)
+        finally:
+            for task in inflight.values():
+                task.cancel()
+            await asyncio.gather(*inflight.values(), return_exceptions=True)
+
+    async def _poll_source(self, url: str, submit: Callable[[Union[str, NewsPayload]], None]):
+        """
+        单个源的一次轮询：扫描完成后立即提交，不等待同批的其他源
+        """
+        try:
+            new_items = await self.scan_source(url)
+        except Exception as e:
+            logger.error(f"Scan failed for {url}: {e}")
+            self.scheduler.observe(url, 0)
+            new_items = []
+        if new_items:
+            logger.info(f"📡 Detected {len(new_items)} items from {urlparse(url).netloc}")
+
+        # 上一次没塞进去的快讯排在最前面
+        pending, self.deferred = self.deferred + new_items, []
+        dropped = 0
+        for item in pending:
+            try:
+                submit(item)
+            except asyncio.QueueFull:
+                if isinstance(item, NewsPayload):
+                    # 快讯游标已前移，接口不会再返回它，只能留到下一次重试
+                    self.deferred.append(item)
+                else:
+                    # frontier 满了就丢弃，并从 seen_urls 移除，下个周期重新发现
+                    self.seen_urls.discard(item)
+                dropped += 1
+        if dropped:
+            logger.warning(f"🚧 URL frontier full, deferred {dropped} items to next scan")
+        # 先交给 frontier (持久化队列已登记)，再提交去重记录
+        self.seen_urls.flush()
@@ -0,0 +1,238 @@
+import hashlib
+import json
+import re
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+from config.settings import settings
+from core.schema import NewsPayload
+
+# 归一化时去掉空白和标点，只保留文字和数字 (转载常改标点、空格和全半角)
+_NOISE = re.compile(r"[\W_]+", re.UNICODE)
+MASK64 = (1 << 64) - 1
+
+
+def _normalize(text: str) -> str:
+    return _NOISE.sub("", (text or "").lower())
+
+
+def _shingles(text: str, size: int = 3) -> List[str]:
+    text = _normalize(text)
+    if len(text) <= size:
+        return [text] if text else []
+    return [text[i:i + size] for i in range(len(text) - size + 1)]
+
+
+def simhash(title: str, content: str = "", title_weight: int = 3, body_chars: int = None) -> int:
+    """
+    64 位 SimHash：字符 3-gram 作为特征，标题特征加权 (转载时标题基本不变，正文常混入站点模板)
+    正文只取归一化后的前 body_chars 个字符：RSS 摘要、快讯和全文的开头基本一致，取同样长度才可比
+    """
+    body_chars = settings.NEAR_DUP_BODY_CHARS if body_chars is None else body_chars
+    weights: Dict[str, int] = {}
+    for gram in _shingles(title):
+        weights[gram] = weights.get(gram, 0) + title_weight
+    body = content or ""
+    # Jina / 本地抽取的 Markdown 第一行是标题，跳过避免重复计权
+    if body.startswith("#"):
+        body = body.split("\n", 1)[-1]
+    for gram in _shingles(_normalize(body)[:body_chars]):
+        weights[gram] = weights.get(gram, 0) + 1
+
+    vector = [0] * 64
+    for gram, weight in weights.items():
+        h = int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(64):
+            vector[bit] += weight if (h >> bit) & 1 else -weight
+    return sum(1 << bit for bit in range(64) if vector[bit] > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & MASK64).count("1")
+
+
+class Cluster:
+    """
+    一个重复簇：簇首 URL + 指纹 + 等待簇首结果的跟随者
+    """
+    def __init__(self, url: str, fingerprints: Dict[str, int], added_at: float):
+        self.url = url
+        self.fingerprints = fingerprints  # 指纹类型 ("title" / "body") -> 64 位指纹
+        self.added_at = added_at
+        self.followers: List[NewsPayload] = []
+        # 簇首已有结果 (分析过)：之后的重复稿直接关闭，不再挂起
+        self.resolved = False
+
+
+class NearDupIndex:
+    """
+    跨源近似重复检测：同一条政策标题被多家转载时只分析第一篇 (簇首)，其余链接到簇首的信号
+    - 两套指纹：标题 + 正文开头 (body)，以及单独的标题指纹 (title)；
+      只有标题的条目和带全文的条目正文长短不一，靠标题指纹仍能对上
+    - SimHash 分段索引 (LSH)：汉明距离 <= k 时，按 k+1 段切分至少有一段完全相同，只比对同段候选
+    - 跟随者挂在簇首下，直到簇首有了结果：分析过则一起关闭；被丢弃、补全文失败或无信号时提拔一篇跟随者接替
+    - 只在时间窗口内比对，过期簇按到达顺序淘汰，内存随窗口而非运行时长增长
+    - 重复关系追加到 DATA_SIGNAL_DIR/clusters_YYYYMMDD.jsonl
+    物理类比：干涉条纹里只要一束参考光，其余同频光束都算同一个模式
+    """
+    KINDS = ("title", "body")
+
+    def __init__(self, max_distance: int = None, window_hours: float = None, out_dir: Path = None,
+                 min_title_chars: int = None):
+        self.max_distance = settings.NEAR_DUP_MAX_DISTANCE if max_distance is None else max_distance
+        self.window = (settings.NEAR_DUP_WINDOW_HOURS if window_hours is None else window_hours) * 3600
+        self.out_dir = out_dir or settings.DATA_SIGNAL_DIR
+        # 标题太短 (如"快讯") 时单独的标题指纹误判太多，只用 body 指纹
+        self.min_title_chars = settings.NEAR_DUP_MIN_TITLE_CHARS if min_title_chars is None else min_title_chars
+        self.bands = max(1, min(self.max_distance + 1, 16))
+        self.band_bits = 64 // self.bands
+        # 每种指纹、每段一个倒排表: 段值 -> [簇]
+        self.tables: Dict[str, List[Dict[int, List[Cluster]]]] = {
+            kind: [{} for _ in range(self.bands)] for kind in self.KINDS
+        }
+        # (登记时间, 簇)，按时间顺序排列，用于窗口淘汰；簇被接替时追加新记录，旧记录淘汰时跳过
+        self.entries: deque = deque()
+        self.clusters: Dict[str, Cluster] = {}  # 簇首 URL -> 簇
+        self.buffer: List[str] = []
+
+    def _band_keys(self, fp: int):
+        mask = (1 << self.band_bits) - 1
+        return [(fp >> (i * self.band_bits)) & mask for i in range(self.bands)]
+
+    def _fingerprints(self, news: NewsPayload) -> Dict[str, int]:
+        fps = {"body": simhash(news.title, news.content or "")}
+        if len(_normalize(news.title)) >= self.min_title_chars:
+            fps["title"] = simhash(news.title, "")
+        return fps
+
+    def _remove(self, cluster: Cluster):
+        for kind, fp in cluster.fingerprints.items():
+            for table, key in zip(self.tables[kind], self._band_keys(fp)):
+                bucket = table.get(key)
+                if bucket is None:
+                    continue
+                bucket[:] = [c for c in bucket if c is not cluster]
+                if not bucket:
+                    del table[key]
+        if self.clusters.get(cluster.url) is cluster:
+            del self.clusters[cluster.url]
+
+    def _promote(self, cluster: Cluster, now: float) -> NewsPayload:
+        """
+        最早到达的跟随者接替簇首，簇重新计时 (否则接替者继承旧时间，很快就被淘汰)
+        """
+        promoted = cluster.followers.pop(0)
+        if self.clusters.get(cluster.url) is cluster:
+            del self.clusters[cluster.url]
+        cluster.url = promoted.url
+        cluster.added_at = now
+        self.clusters[promoted.url] = cluster
+        self.entries.append((now, cluster))
+        return promoted
+
+    def expire(self, now: float = None) -> List[NewsPayload]:
+        """
+        淘汰窗口外的簇；簇首迟迟没有结果、仍挂着跟随者的簇不直接丢弃，
+        由一篇跟随者接替并返回给调用方送往下游，其余跟随者继续挂在接替者下
+        """
+        now = time.time() if now is None else now
+        promoted = []
+        while self.entries and now - self.entries[0][0] > self.window:
+            added_at, cluster = self.entries.popleft()
+            if added_at != cluster.added_at:
+                # 簇已被接替并重新计时，这是旧记录
+                continue
+            if cluster.followers and not cluster.resolved:
+                logger.warning(f"NearDup leader {cluster.url} expired without outcome, "
+                               f"promoting one of {len(cluster.followers)} held duplicates")
+                promoted.append(self._promote(cluster, now))
+                continue
+            self._remove(cluster)
+        return promoted
+
+    def match_or_add(self, news: NewsPayload) -> Optional[str]:
+        """
+        返回近似重复的簇首 URL；没有重复时把该条目登记为新的簇首并返回 None
+        调用前先 expire()，处理窗口外仍挂着跟随者的簇
+        """
+        now = time.time()
+        fps = self._fingerprints(news)
+
+        best: Optional[Tuple[int, Cluster]] = None
+        for kind, fp in fps.items():
+            for table, key in zip(self.tables[kind], self._band_keys(fp)):
+                for cluster in table.get(key, ()):
+                    other_fp = cluster.fingerprints.get(kind)
+                    if other_fp is None:
+                        continue
+                    distance = hamming(fp, other_fp)
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, cluster)
+        if best is not None:
+            distance, cluster = best
+            if cluster.url == news.url:
+                # 同一条目再次出现 (例如崩溃恢复)，不算重复
+                return None
+            self.buffer.append(json.dumps({
+                "url": news.url,
+                "source": news.source,
+                "title": news.title,
+                "leader_url": cluster.url,
+                "distance": distance,
+                "linked_at": datetime.now().isoformat(timespec="seconds"),
+            }, ensure_ascii=False))
+            return cluster.url
+
+        cluster = Cluster(news.url, fps, now)
+        for kind, fp in fps.items():
+            for table, key in zip(self.tables[kind], self._band_keys(fp)):
+                table.setdefault(key, []).append(cluster)
+        self.entries.append((now, cluster))
+        self.clusters[news.url] = cluster
+        return None
+
+    def hold(self, news: NewsPayload, leader: str) -> bool:
+        """
+        簇首还没有结果时把重复稿挂起，返回 True；簇首已分析过 (或已淘汰) 时返回 False，调用方直接关闭
+        """
+        cluster = self.clusters.get(leader)
+        if cluster is None or cluster.resolved:
+            return False
+        cluster.followers.append(news)
+        return True
+
+    def resolve(self, url: str, analysed: bool) -> Tuple[List[NewsPayload], Optional[NewsPayload]]:
+        """
+        簇首有了结果，返回 (可以关闭的跟随者, 接替分析的跟随者)
+        - analysed: 簇首已被分析 (快通道判噪声或产出信号)，跟随者全部关闭
+        - 否则 (被丢弃 / 补全文失败 / 无信号)：最早到达的跟随者接替为簇首；
+          没有跟随者时把簇移出索引，下一篇转载稿会成为新的簇首
+        """
+        cluster = self.clusters.get(url)
+        if cluster is None or cluster.resolved:
+            return [], None
+        if analysed:
+            cluster.resolved = True
+            followers, cluster.followers = cluster.followers, []
+            return followers, None
+        if not cluster.followers:
+            self._remove(cluster)
+            return [], None
+        return [], self._promote(cluster, time.time())
+
+    def flush(self):
+        """
+        把缓冲的重复链接追加到当天的 clusters 文件
+        """
+        if not self.buffer:
+            return
+        lines, self.buffer = self.buffer, []
+        path = self.out_dir / f"clusters_{datetime.now().strftime('%Y%m%d')}.jsonl"
+        try:
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write duplicate clusters: {e}")
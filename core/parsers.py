@@ -0,0 +1,156 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Type, Tuple
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+from core.schema import NewsPayload
+
+try:
+    import orjson  # 可选加速：比标准库 json 快数倍
+except ImportError:
+    orjson = None
+
+
+def loads(text: str) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class JsonApiParser:
+    """
+    JSON 快讯接口解析器基类
+    每个数据源只做一次 decode + 一次 extract，不再对响应内容做格式猜测
+    (唯一的调用路径是 CursorPoller.poll：decode -> items -> cursor 过滤 -> to_payload)
+    子类声明 hosts (可选 path_prefix)，用 @register_parser 注册即可接入
+    """
+    name: str = "generic"
+    hosts: tuple = ()
+    path_prefix: str = ""
+    source: str = "Unknown"
+
+    def decode(self, text: str) -> Any:
+        return loads(text)
+
+    def items(self, data: Any) -> List[Dict]:
+        raise NotImplementedError
+
+    def to_payload(self, item: Dict, url: str) -> NewsPayload:
+        raise NotImplementedError
+
+    def cursor(self, item: Dict) -> Optional[Tuple]:
+        """
+        条目的增量游标 (可比较，越大越新)；返回 None 表示该源不支持增量
+        """
+        return None
+
+    def page_url(self, url: str, page: int) -> Optional[str]:
+        """
+        第 page 页的地址 (用于突发时向后翻页补齐)；返回 None 表示不支持翻页
+        """
+        return None
+
+
+# host -> 该域名下注册的解析器 (按 path_prefix 长度降序，最具体的优先)
+_REGISTRY: Dict[str, List[JsonApiParser]] = {}
+
+
+def register_parser(cls: Type[JsonApiParser]) -> Type[JsonApiParser]:
+    parser = cls()
+    for host in cls.hosts:
+        bucket = _REGISTRY.setdefault(host, [])
+        bucket.append(parser)
+        bucket.sort(key=lambda p: len(p.path_prefix), reverse=True)
+    return cls
+
+
+def _id_key(value: Any) -> int:
+    value = str(value or "")
+    return int(value) if value.isdigit() else 0
+
+
+def _set_query_param(url: str, key: str, value: Any) -> str:
+    parsed = urlparse(url)
+    query = dict(parse_qsl(parsed.query, keep_blank_values=True))
+    query[key] = str(value)
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def get_parser(url: str) -> Optional[JsonApiParser]:
+    """
+    按 host (+ 路径前缀) 查找解析器，找不到返回 None
+    """
+    parsed = urlparse(url)
+    for parser in _REGISTRY.get((parsed.hostname or "").lower(), []):
+        if parsed.path.startswith(parser.path_prefix):
+            return parser
+    return None
+
+
+@register_parser
+class EastMoneyKuaixunParser(JsonApiParser):
+    """
+    东方财富快讯: 响应形如 var ajaxResult={...};
+    """
+    name = "eastmoney_kuaixun"
+    hosts = ("newsapi.eastmoney.com", "api.eastmoney.com")
+    source = "EastMoney_API"
+
+    def decode(self, text: str) -> Any:
+        text = text.strip()
+        if text.startswith("var ajaxResult="):
+            text = text[len("var ajaxResult="):].rstrip(";")
+        return loads(text)
+
+    def items(self, data: Any) -> List[Dict]:
+        return data.get("LivesList") or []
+
+    def to_payload(self, item: Dict, url: str) -> NewsPayload:
+        return NewsPayload(
+            url=item.get('url_unique', url), # 如果没有独立URL，就用API URL作为占位
+            title=item.get('simtitle', item.get('title', 'Unknown')),
+            content=item.get('digest', item.get('simdigest', '')),
+            source=self.source
+        )
+
+    def cursor(self, item: Dict) -> Optional[Tuple]:
+        showtime = item.get('showtime')
+        if not showtime:
+            return None
+        return (showtime, _id_key(item.get('id') or item.get('newsid')))
+
+    def page_url(self, url: str, page: int) -> Optional[str]:
+        # getlist_102_ajaxResult_50_1_.html -> getlist_102_ajaxResult_50_{page}_.html
+        new_url, n = re.subn(r"(_ajaxResult_\d+_)\d+(_)", rf"\g<1>{page}\g<2>", url)
+        return new_url if n else None
+
+
+@register_parser
+class SinaZhiboParser(JsonApiParser):
+    """
+    新浪财经 7x24 直播
+    """
+    name = "sina_zhibo"
+    hosts = ("zhibo.sina.com.cn",)
+    path_prefix = "/api/zhibo/feed"
+    source = "Sina_API"
+
+    def items(self, data: Any) -> List[Dict]:
+        return data["result"]["data"]["feed"]["list"]
+
+    def to_payload(self, item: Dict, url: str) -> NewsPayload:
+        text = item.get('rich_text', item.get('plain_text', ''))
+        return NewsPayload(
+            url=item.get('docurl', url),
+            title=text[:50] or 'Unknown', # 新浪快讯往往没有标题，截取内容前段
+            content=text,
+            source=self.source
+        )
+
+    def cursor(self, item: Dict) -> Optional[Tuple]:
+        create_time = item.get('create_time')
+        if not create_time:
+            return None
+        return (create_time, _id_key(item.get('id')))
+
+    def page_url(self, url: str, page: int) -> Optional[str]:
+        return _set_query_param(url, "page", page)
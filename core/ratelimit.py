@@ -0,0 +1,71 @@
+import asyncio
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from config.settings import settings
+
+
+class TokenBucket:
+    """
+    令牌桶：平均速率 rate 个/秒，最多攒 burst 个令牌 (允许短时突发)
+    等待者按 FIFO 排队，不会出现饥饿
+    """
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated_at: Optional[float] = None
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self.updated_at is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            self._refill(loop.time())
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill(loop.time())
+            self.tokens -= 1
+
+
+class HostRateLimiter:
+    """
+    按域名限速：HOST_RATE_LIMITS 中的规则按域名后缀匹配，同一规则下的子域名共享一个桶
+    (例如 newsapi.eastmoney.com 和 finance.eastmoney.com 共用 eastmoney.com 的额度)
+    未配置的域名使用 DEFAULT_HOST_RATE，0 表示不限速
+    """
+    def __init__(self, limits: Dict[str, float] = None, burst: float = None, default_rate: float = None):
+        self.limits = {k.lower(): v for k, v in (settings.HOST_RATE_LIMITS if limits is None else limits).items()}
+        self.burst = settings.HOST_RATE_BURST if burst is None else burst
+        self.default_rate = settings.DEFAULT_HOST_RATE if default_rate is None else default_rate
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _bucket_for(self, host: str) -> Optional[TokenBucket]:
+        rule = next(
+            (k for k in sorted(self.limits, key=len, reverse=True) if host == k or host.endswith("." + k)),
+            None,
+        )
+        key, rate = (rule, self.limits[rule]) if rule else (host, self.default_rate)
+        if rate <= 0:
+            return None
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(rate, self.burst)
+        return bucket
+
+    async def acquire(self, url: str):
+        """
+        发请求前调用：按目标域名取一个令牌，额度不足时等待
+        """
+        host = (urlparse(url).hostname or "").lower()
+        bucket = self._bucket_for(host)
+        if bucket is None:
+            return
+        await bucket.acquire()
+
+
+# 全局共享实例：爬虫和雷达使用同一组令牌桶
+host_limiter = HostRateLimiter()
@@ -0,0 +1,84 @@
+import time
+from typing import Dict, Iterable, List, Optional
+from config.settings import settings
+
+
+class SourceSchedule:
+    """
+    单个源的轮询状态
+    rate: 新条目到达速率的指数滑动平均 (条/秒)
+    """
+    def __init__(self, interval: float, now: float):
+        self.interval = interval
+        self.rate = 1.0 / interval
+        self.next_due = now
+        self.last_polled: Optional[float] = None
+
+
+class PollScheduler:
+    """
+    按源自适应轮询：根据观测到的新条目到达速率，为每个源单独估计轮询间隔
+    - 目标是平均每次轮询带回约 1 条新内容：间隔 ≈ 1 / 到达速率
+    - 没有新内容时速率估计自然衰减，间隔逐步拉长；突然活跃时迅速缩短
+    - 间隔限制在 [min_interval, max_interval] 内
+    物理类比：采样率跟着信号带宽走，高频信号密采，慢变信号稀采
+    """
+    def __init__(self, sources: List[str], min_interval: float = None, max_interval: float = None,
+                 initial_interval: float = None, alpha: float = None):
+        self.min_interval = settings.POLL_MIN_INTERVAL if min_interval is None else min_interval
+        self.max_interval = settings.POLL_MAX_INTERVAL if max_interval is None else max_interval
+        self.max_interval = max(self.min_interval, self.max_interval)
+        initial = settings.SCAN_INTERVAL if initial_interval is None else initial_interval
+        self.initial_interval = self._clamp(initial)
+        self.alpha = settings.POLL_EWMA_ALPHA if alpha is None else alpha
+        now = time.monotonic()
+        self.sources: Dict[str, SourceSchedule] = {
+            url: SourceSchedule(self.initial_interval, now) for url in sources
+        }
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def due(self, now: float = None) -> List[str]:
+        """
+        当前到期、应该轮询的源
+        """
+        now = time.monotonic() if now is None else now
+        return [url for url, s in self.sources.items() if s.next_due <= now]
+
+    def observe(self, url: str, new_items: int, now: float = None):
+        """
+        轮询完成后回报本次发现的新条目数，更新速率估计并安排下一次轮询
+        """
+        now = time.monotonic() if now is None else now
+        s = self.sources.get(url)
+        if s is None:
+            s = self.sources[url] = SourceSchedule(self.initial_interval, now)
+        # 第一次轮询会带回源上的全部存量内容，不代表更新频率，不计入估计
+        if s.last_polled is not None:
+            elapsed = max(now - s.last_polled, 1e-3)
+            s.rate = (1 - self.alpha) * s.rate + self.alpha * (new_items / elapsed)
+            s.interval = self._clamp(1.0 / s.rate if s.rate > 0 else self.max_interval)
+        s.last_polled = now
+        # 按计划时间推进，保持节拍；落后太多则从现在重新计时
+        s.next_due = max(s.next_due + s.interval, now)
+
+    def sleep_time(self, now: float = None, busy: Iterable[str] = ()) -> float:
+        """
+        距离下一个源到期还要等多久 (busy 中正在轮询的源不参与计算)
+        """
+        now = time.monotonic() if now is None else now
+        idle = [s.next_due for url, s in self.sources.items() if url not in busy]
+        if not idle:
+            return self.max_interval
+        return max(0.0, min(idle) - now)
+
+    def summary(self) -> str:
+        """
+        例: zhibo.sina.com.cn=12s | www.ftchinese.com=600s
+        """
+        parts = []
+        for url, s in sorted(self.sources.items(), key=lambda kv: kv[1].interval):
+            host = url.split("/")[2] if "://" in url else url
+            parts.append(f"{host}={s.interval:.0f}s")
+        return " | ".join(parts)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import List, Optional, Literal, Union
+from typing import List, Optional, Literal, Union, Dict
 from datetime import datetime
 import math
 
@@ -12,6 +12,12 @@ class NewsPayload(BaseModel):
     content: Optional[str] = None
     source: str = "Unknown"
     fetched_at: datetime = Field(default_factory=datetime.now)
+    # 源头发布时间 (RSS 条目自带，未知时为空)
+    published_at: Optional[datetime] = None
+    # 条目级 ID：快讯没有独立链接、用接口地址占位时由轮询器填写，持久化队列据此区分条目
+    item_id: Optional[str] = None
+    # 各阶段边界的单调时钟打点 (仅进程内有效，不参与序列化)
+    trace: Dict[str, float] = Field(default_factory=dict, exclude=True)
 
 class SignalAnalysis(BaseModel):
     """
@@ -33,6 +39,8 @@ class SignalAnalysis(BaseModel):
     
     # 原始引用
     source_url: str
+    # 对应 NewsPayload.item_id (只在流水线内部使用，不写入信号文件)
+    item_id: Optional[str] = Field(default=None, exclude=True)
 
     @field_validator('related_stocks')
     def validate_stock_codes(cls, v):
@@ -0,0 +1,109 @@
+import json
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+from loguru import logger
+from config.settings import settings
+from core.schema import NewsPayload
+
+# 阶段区间定义：(名称, 起点打点, 终点打点)
+# 只有起止两个打点都存在时才计算该区间 (例如廉价通道没有 ensemble/adversarial)
+# 起点可以是候选元组，取第一个存在的打点 (补过全文的条目，慢通道排队从补全文结束算起)
+STAGE_SPANS = [
+    ("crawl", "crawl_start", "crawl_end"),
+    ("fast_wait", "crawl_end", "fast_start"),
+    ("fast_llm", "fast_start", "fast_end"),
+    ("hydrate_wait", "fast_end", "hydrate_start"),
+    ("hydrate", "hydrate_start", "hydrate_end"),
+    ("slow_wait", ("hydrate_end", "fast_end"), "slow_start"),
+    ("ensemble", "slow_start", "ensemble_end"),
+    ("adversarial", "ensemble_end", "adversarial_end"),
+    ("slow_total", "slow_start", "slow_end"),
+    ("persist_wait", "slow_end", "persist_start"),
+    ("write", "persist_start", "written"),
+]
+
+
+def mark(news: NewsPayload, point: str, ts: float = None):
+    """
+    在阶段边界打点 (单调时钟)
+    """
+    news.trace[point] = time.monotonic() if ts is None else ts
+
+
+def spans(trace: Dict[str, float]) -> Dict[str, float]:
+    """
+    把打点换算成各阶段耗时 (秒)
+    """
+    result = {}
+    for name, start, end in STAGE_SPANS:
+        if isinstance(start, tuple):
+            start = next((point for point in start if point in trace), None)
+        if start in trace and end in trace:
+            result[name] = trace[end] - trace[start]
+    if len(trace) >= 2:
+        result["end_to_end"] = max(trace.values()) - min(trace.values())
+    return result
+
+
+class TraceRecorder:
+    """
+    阶段耗时记录器：每条新闻结束时导出一行 JSON，并维护各阶段滚动窗口的 p50/p95/p99
+    物理类比：在每个光学元件后面放一个探测器，找出损耗最大的那一级
+    """
+    def __init__(self, path: Path = None, window: int = None):
+        self.enabled = settings.TRACE_ENABLED
+        self.path = path or (settings.LOG_DIR / "traces.jsonl")
+        self.window = window or settings.TRACE_WINDOW
+        self.samples: Dict[str, deque] = {}
+        self.buffer: List[str] = []
+
+    def record(self, trace: Dict[str, float], url: str, outcome: str):
+        """
+        一条新闻走完流水线 (无论结果如何) 时调用
+        """
+        if not self.enabled or not trace:
+            return
+        durations = spans(trace)
+        for name, value in durations.items():
+            self.samples.setdefault(name, deque(maxlen=self.window)).append(value)
+        self.buffer.append(json.dumps({
+            "url": url,
+            "outcome": outcome,
+            "spans": {k: round(v, 4) for k, v in durations.items()},
+        }, ensure_ascii=False))
+
+    def flush(self):
+        """
+        把缓冲的 trace 追加到 JSONL 文件 (随 Pipeline Stats 一起周期性调用)
+        """
+        if not self.buffer:
+            return
+        lines, self.buffer = self.buffer, []
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(lines) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to write traces: {e}")
+
+    def percentiles(self) -> Dict[str, Optional[tuple]]:
+        result = {}
+        for name, values in self.samples.items():
+            if values:
+                p50, p95, p99 = np.percentile(np.fromiter(values, dtype=float), [50, 95, 99])
+                result[name] = (p50, p95, p99)
+        return result
+
+    def summary(self) -> str:
+        """
+        例: crawl=0.81/2.10/3.02s | fast_llm=...  (p50/p95/p99)
+        """
+        order = [name for name, _, _ in STAGE_SPANS] + ["end_to_end"]
+        stats = self.percentiles()
+        parts = [
+            f"{name}={stats[name][0]:.2f}/{stats[name][1]:.2f}/{stats[name][2]:.2f}s"
+            for name in order if name in stats
+        ]
+        return " | ".join(parts)
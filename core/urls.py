@@ -0,0 +1,94 @@
+import re
+from typing import Dict, Set
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from config.settings import settings
+
+# 通用跟踪参数：任何域名都去掉
+TRACKING_PARAMS = {
+    "spm", "from", "fromsource", "source", "share", "share_token", "sharetype", "share_from",
+    "wfr", "tt_from", "timestamp", "ts", "isappinstalled", "scene", "clicktime", "enterid",
+    "fbclid", "gclid", "mc_cid", "mc_eid", "ref", "referer", "_hsenc", "_hsmi",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# 按域名后缀额外去掉的参数 (小写)，只列已知的渠道/统计参数
+# 不能整串清空：eastmoney 的 artCode、21jingji 的 show.html?id=、caixin 的 /m/?id= 都是文章 ID
+HOST_RULES: Dict[str, Set[str]] = {
+    "sina.com.cn": {"vt", "pos", "cre", "mod", "loc", "r", "rfunc", "tj"},
+    "eastmoney.com": {"fr", "jumpfrom", "sharefrom", "fromtype"},
+    "21jingji.com": {"sharefrom", "channel"},
+    "huxiu.com": {"f", "share_platform"},
+    "36kr.com": {"f", "channel"},
+    "ftchinese.com": {"ccode", "adchannelid", "exclusive", "topnav", "subnav"},
+    "jiemian.com": {"shareid", "channel"},
+    "caixin.com": {"originreferrer", "sourceentityid", "p0"},
+    "zaobao.com.sg": {"amp", "channel"},
+}
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+
+def _host_drop(host: str) -> Set[str]:
+    for suffix in sorted(HOST_RULES, key=len, reverse=True):
+        if host == suffix or host.endswith("." + suffix):
+            return HOST_RULES[suffix]
+    return set()
+
+
+def _canonical_host(host: str) -> str:
+    """
+    移动版域名映射到桌面版：先查 URL_HOST_ALIASES 精确映射，
+    再对 URL_MOBILE_HOST_SUFFIXES 中的站点做通用的 m.xxx / wap.xxx -> www.xxx
+    """
+    host = host.lower().rstrip(".")
+    alias = settings.URL_HOST_ALIASES.get(host)
+    if alias:
+        return alias
+    match = re.match(r"^(?:m|wap|3g|mobile)\.(.+)$", host)
+    if match:
+        base = match.group(1)
+        if any(base == s or base.endswith("." + s) for s in settings.URL_MOBILE_HOST_SUFFIXES):
+            return "www." + base
+    return host
+
+
+def canonical_url(url: str) -> str:
+    """
+    URL 规范化 (只用于去重和缓存键，抓取和 payload 保留原始链接)，同一篇文章的不同写法归一到同一个 URL：
+    - scheme / host 小写，去掉默认端口和锚点
+    - 移动版域名映射到桌面版
+    - 去掉 utm_* 等跟踪参数和域名规则里的渠道参数，剩余参数 (含文章 ID) 排序
+    - 去掉路径末尾的斜杠 (根路径除外)
+    """
+    url = url.strip()
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = _canonical_host(parts.hostname)
+    netloc = host
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(parts.scheme):
+        netloc = f"{host}:{parts.port}"
+
+    drop = _host_drop(host)
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        lower = key.lower()
+        if lower in TRACKING_PARAMS or lower in drop or lower.startswith(TRACKING_PREFIXES):
+            continue
+        params.append((key, value))
+    query = urlencode(sorted(params))
+
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+
+    return urlunsplit((parts.scheme.lower(), netloc, path, query, ""))
+
+
+def dedup_key(url: str) -> str:
+    """
+    去重 / 缓存用的键：规范化 URL 去掉 scheme (http 与 https 视为同一篇)
+    """
+    canonical = canonical_url(url)
+    return canonical.split("://", 1)[-1]
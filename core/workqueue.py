@@ -0,0 +1,137 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Tuple, Optional, Union
+from loguru import logger
+from config.settings import settings
+from core.archive import url_hash
+from core.schema import NewsPayload, SignalAnalysis
+
+
+def item_key(item: Union[str, NewsPayload, SignalAnalysis]) -> str:
+    """
+    工作队列的行键：有独立链接的条目按 URL；快讯用接口地址占位时按条目级 ID，
+    否则同一接口的所有快讯会挤在一行里，互相覆盖、一次 ack 全部完成
+    """
+    if isinstance(item, str):
+        return url_hash(item)
+    if item.item_id:
+        return url_hash(item.item_id)
+    return url_hash(item.url if isinstance(item, NewsPayload) else item.source_url)
+
+
+class DurableWorkQueue:
+    """
+    持久化工作队列 (SQLite WAL)：记录每条新闻当前走到了流水线的哪一级
+    进程崩溃重启后，未完成的条目从断点恢复：
+      - frontier: 只有 URL，尚未抓取
+      - fast / slow: 已抓取 (保存了 NewsPayload)，无需重新抓取
+      - hydrate: 标题已通过快通道，等待抓取全文 (保存了只有标题的 NewsPayload)
+      - persist: 已分析 (保存了 SignalAnalysis)，无需重新消耗 LLM Token
+      - done: 已完成 (只保留 URL 用于去重，超过保留期后清理)
+    """
+    STAGES = ("frontier", "fast", "hydrate", "slow", "persist")
+
+    def __init__(self, path: Path = None):
+        self.path = path or settings.DURABLE_QUEUE_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS work_items (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                stage TEXT NOT NULL,
+                payload TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_work_stage ON work_items(stage)")
+        self._prune_done()
+        self.conn.commit()
+
+    def _prune_done(self):
+        cutoff = time.time() - settings.DURABLE_QUEUE_RETENTION_DAYS * 86400
+        cur = self.conn.execute(
+            "DELETE FROM work_items WHERE stage = 'done' AND updated_at < ?", (cutoff,)
+        )
+        if cur.rowcount:
+            logger.info(f"🧹 Pruned {cur.rowcount} finished items from durable queue")
+
+    def close(self):
+        self.conn.close()
+
+    # ---------- 状态推进 ----------
+
+    def record_url(self, url: str):
+        """
+        新发现的 URL (尚未抓取)，已存在的条目不覆盖
+        """
+        self.conn.execute(
+            "INSERT OR IGNORE INTO work_items (key, url, stage, payload, updated_at) VALUES (?, ?, 'frontier', NULL, ?)",
+            (item_key(url), url, time.time()),
+        )
+        self.conn.commit()
+
+    def checkpoint(self, stage: str, news: NewsPayload = None, analysis: SignalAnalysis = None):
+        """
+        条目进入新的一级，保存恢复所需的最小载荷
+        """
+        if analysis is not None:
+            # item_id 不写入信号文件 (exclude)，但恢复时需要它来找回对应的行
+            item, url = analysis, analysis.source_url
+            payload = json.dumps({**analysis.model_dump(mode="json"), "item_id": analysis.item_id}, ensure_ascii=False)
+        else:
+            item, url, payload = news, news.url, news.model_dump_json()
+        self.conn.execute(
+            """
+            INSERT INTO work_items (key, url, stage, payload, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET stage = excluded.stage, payload = excluded.payload, updated_at = excluded.updated_at
+            """,
+            (item_key(item), url, stage, payload, time.time()),
+        )
+        self.conn.commit()
+
+    def ack(self, *items: Union[str, NewsPayload, SignalAnalysis]):
+        """
+        确认完成：只保留 URL 供重启后去重，载荷清空
+        """
+        self.ack_keys(*(item_key(item) for item in items))
+
+    def ack_keys(self, *keys: str):
+        if not keys:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE work_items SET stage = 'done', payload = NULL, updated_at = ? WHERE key = ?",
+            [(now, key) for key in keys],
+        )
+        self.conn.commit()
+
+    def drop(self, url: str):
+        """
+        移除条目 (例如 API 地址这种"生成器" URL，抓取完成后不需要保留)
+        """
+        self.conn.execute("DELETE FROM work_items WHERE key = ?", (item_key(url),))
+        self.conn.commit()
+
+    # ---------- 恢复 ----------
+
+    def pending(self) -> List[Tuple[str, str, str, Optional[str]]]:
+        """
+        返回所有未完成条目 (key, stage, url, payload)，按进入时间排序
+        """
+        rows = self.conn.execute(
+            "SELECT key, stage, url, payload FROM work_items WHERE stage != 'done' ORDER BY updated_at"
+        )
+        return list(rows)
+
+    def known_urls(self) -> List[str]:
+        """
+        所有已知 URL (含已完成)，用于重启后预热雷达的去重集合
+        """
+        return [row[0] for row in self.conn.execute("SELECT url FROM work_items")]
@@ -0,0 +1,111 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import Optional, Dict, List, Callable
+from loguru import logger
+from config.settings import settings
+from core.schema import SignalAnalysis
+
+
+class SignalWriter:
+    """
+    信号落盘：单个后台 writer 持有各时间尺度 signals_*.jsonl 的文件句柄
+    记录先攒批，满 SIGNAL_FLUSH_BATCH 条或超过 SIGNAL_FLUSH_INTERVAL 秒写一次，
+    每 SIGNAL_FSYNC_INTERVAL 秒 fsync 一次。每批整行一次 write，不会出现半行交错
+    """
+    def __init__(self, root: Path = None, on_flushed: Callable[[List[SignalAnalysis]], None] = None):
+        self.root = root or settings.DATA_SIGNAL_DIR
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.flush_batch = max(1, settings.SIGNAL_FLUSH_BATCH)
+        self.flush_interval = max(0.05, settings.SIGNAL_FLUSH_INTERVAL)
+        self.fsync_interval = settings.SIGNAL_FSYNC_INTERVAL
+
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.SIGNAL_WRITER_QUEUE_SIZE)
+        self.handles: Dict[str, object] = {}
+        self.writer_task: Optional[asyncio.Task] = None
+        self.written = 0
+        # 写入成功后的回调 (例如持久化队列的 ack)
+        self.on_flushed = on_flushed
+
+    def start(self):
+        if self.writer_task:
+            return
+        self.writer_task = asyncio.create_task(self._writer())
+
+    async def close(self):
+        """
+        发送哨兵，等待剩余记录写完并 fsync 后关闭所有句柄
+        """
+        if not self.writer_task:
+            return
+        await self.queue.put(None)
+        await self.writer_task
+        self.writer_task = None
+        for fh in self.handles.values():
+            fh.close()
+        self.handles = {}
+
+    async def write(self, analysis: SignalAnalysis):
+        """
+        提交一条信号 (仅入队)
+        """
+        await self.queue.put(analysis)
+
+    async def _writer(self):
+        loop = asyncio.get_running_loop()
+        buffers: Dict[str, List[str]] = {}
+        batch: List[SignalAnalysis] = []
+        pending = 0
+        last_flush = last_fsync = loop.time()
+
+        while True:
+            stop = False
+            timeout = max(0.0, last_flush + self.flush_interval - loop.time())
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+                if item is None:
+                    stop = True
+                else:
+                    buffers.setdefault(item.time_horizon, []).append(item.model_dump_json() + "\n")
+                    batch.append(item)
+                    pending += 1
+            except asyncio.TimeoutError:
+                pass
+
+            now = loop.time()
+            if not (stop or pending >= self.flush_batch or now - last_flush >= self.flush_interval):
+                continue
+
+            do_fsync = stop or (self.fsync_interval > 0 and now - last_fsync >= self.fsync_interval)
+            if pending or do_fsync:
+                try:
+                    await asyncio.to_thread(self._flush, buffers, do_fsync)
+                    self.written += pending
+                    if self.on_flushed and batch:
+                        self.on_flushed(batch)
+                except Exception as e:
+                    logger.error(f"Failed to persist {pending} signals: {e}")
+                buffers = {}
+                batch = []
+                pending = 0
+                if do_fsync:
+                    last_fsync = now
+            last_flush = now
+
+            if stop:
+                break
+
+    def _flush(self, buffers: Dict[str, List[str]], do_fsync: bool):
+        """
+        在线程中执行：每个文件一次 write，按需 fsync
+        """
+        for horizon, lines in buffers.items():
+            fh = self.handles.get(horizon)
+            if fh is None:
+                fh = open(self.root / f"signals_{horizon}.jsonl", 'a', encoding='utf-8')
+                self.handles[horizon] = fh
+            fh.write("".join(lines))
+            fh.flush()
+        if do_fsync:
+            for fh in self.handles.values():
+                os.fsync(fh.fileno())
@@ -1,6 +1,8 @@
 import asyncio
 import sys
-import aiofiles
+import time
+from typing import Callable, Optional, Union
+from datetime import datetime
 from loguru import logger
 from config.settings import settings
 from core.crawler import AsyncCrawler
@@ -8,8 +10,14 @@ from core.engine import LLMEngine
 from core.schema import NewsPayload, SignalAnalysis
 # main.py 头部增加导入
 from core.monitor import NewsMonitor
-from core.calibrator import SignalCalibrator
+from core.calibrator import SignalCalibrator, apply_time_decay
 from core.filter import SignalFilter
+from core.archive import RawArchive
+from core.writer import SignalWriter
+from core.workqueue import DurableWorkQueue, item_key
+from core.frontier import PriorityNewsQueue
+from core.trace import TraceRecorder, mark
+from core.neardup import NearDupIndex
 
 # 配置日志
 logger.remove()
@@ -17,113 +25,523 @@ logger.add(sys.stderr, level="INFO")
 logger.add(settings.LOG_DIR / "finnews_master.log", rotation="10 MB", level="DEBUG")
 
 class FinNewsPipeline:
+    """
+    多级流水线：抓取 -> 快通道过滤 -> 补全文 -> 慢通道深度分析 -> 持久化
+    只有标题的条目 (标题优先) 先过快通道，判为相关后才在补全文阶段抓取正文
+    每一级有独立的有界队列和 worker 数量，队列满时自动向上游施加背压
+    """
     def __init__(self):
         self.crawler = AsyncCrawler()
         self.engine = LLMEngine()
-        self.queue = asyncio.Queue(maxsize=100) # 缓冲区大小
         self.calibrator = SignalCalibrator()
+        self.archive = RawArchive()
+        # 可选的持久化工作队列：崩溃重启后从断点恢复
+        self.workqueue = DurableWorkQueue() if settings.DURABLE_QUEUE_ENABLED else None
+        self.signal_writer = SignalWriter(on_flushed=self._on_signals_flushed)
+        # 阶段耗时追踪：进入落盘阶段的条目按工作队列键 (item_key) 暂存 trace，写盘后结算
+        self.tracer = TraceRecorder()
+        self.pending_traces: dict[str, tuple[str, dict]] = {}
+        # 条目走完流水线 (无论结果如何) 时的回调，雷达据此把 URL 的去重记录落盘
+        self.on_settled: Optional[Callable[[str], None]] = None
+        # 跨源近似重复检测：转载稿只分析簇首一次，其余链接到簇首
+        self.neardup = NearDupIndex() if settings.NEAR_DUP_ENABLED else None
+
+        # 各级缓冲区 (队列满时 put 会阻塞，形成逐级背压)
+        # 快/慢通道使用优先级队列：高价值来源、关键词命中、新鲜的新闻先处理
+        self.queue = PriorityNewsQueue(maxsize=settings.FAST_QUEUE_SIZE)        # 抓取 -> 快通道
+        self.hydrate_queue = PriorityNewsQueue(maxsize=settings.HYDRATE_QUEUE_SIZE)  # 快通道 -> 补全文
+        self.slow_queue = PriorityNewsQueue(maxsize=settings.SLOW_QUEUE_SIZE)   # 快通道 -> 慢通道
+        self.persist_queue = asyncio.Queue(maxsize=settings.PERSIST_QUEUE_SIZE) # 慢通道 -> 落盘
+
+        # 流水线级定义：(名称, 输入队列, 处理函数, worker 数)
+        # 顺序即数据流向，关闭时按此顺序逐级排空
+        self.stages = [
+            ("fast", self.queue, self.fast_stage, max(1, settings.FAST_WORKERS)),
+            ("hydrate", self.hydrate_queue, self.hydrate_stage, max(1, settings.HYDRATE_WORKERS)),
+            ("slow", self.slow_queue, self.slow_stage, max(1, settings.SLOW_WORKERS)),
+            ("persist", self.persist_queue, self.persist_stage, max(1, settings.PERSIST_WORKERS)),
+        ]
+        self.stage_tasks: dict[str, list[asyncio.Task]] = {}
+
+        # URL 边界队列：雷达只管往里放，生产者在后台独立消费
+        self.frontier = asyncio.Queue(maxsize=settings.URL_FRONTIER_SIZE)
+        # 抓取扇出上限，与 AsyncCrawler 的信号量保持一致
+        self.crawl_slots = asyncio.Semaphore(settings.MAX_CRAWLER_CONCURRENCY)
+        self.crawl_tasks: set[asyncio.Task] = set()
+        # 近似重复接替者交回补全文队列的在途任务 (不能让 worker 阻塞在自己这一级的队列上)
+        self.handoff_tasks: set[asyncio.Task] = set()
+        self.handoffs = 0
+
+        # 所有 worker 共享的统计计数 (单线程事件循环，无需加锁)
+        self.stats = {
+            'crawled': 0,
+            'fast_pass': 0,
+            # 标题优先：快通道通过后补抓全文的条目 / 补抓失败的条目
+            'hydrated': 0,
+            'hydrate_failed': 0,
+            'valid_signal': 0,
+            # 超出延迟预算被降级处理的条目
+            'shed_skipped': 0,
+            'shed_cheap': 0,
+            'shed_downgraded': 0,
+            # 近似重复 (链接到簇首，不再调用 LLM)
+            'near_dup': 0
+        }
         
     async def producer(self, urls: list[str]):
         """
-        生产者：负责抓取数据并放入队列
+        生产者：并发抓取一批 URL，谁先完成谁先进入快通道队列
+        并发度受 MAX_CRAWLER_CONCURRENCY 限制，总耗时约等于最慢的几个请求
         """
-        for url in urls:
-            result = await self.crawler.process_url(url)
-            if result:
-                if isinstance(result, list):
-                     for news in result:
-                         await self.queue.put(news)
-                else:
-                     await self.queue.put(result)
+        tasks = [await self._spawn_crawl(url) for url in urls]
+        await asyncio.gather(*tasks, return_exceptions=True)
         
-        # 放置结束哨兵
-        await self.queue.put(None)
+        # 注意：这里不放置结束哨兵，哨兵由 stop_workers 统一发送
+        # 否则 main_loop 中多次调用 producer 会把下游提前关掉
         logger.info("📡 Producer finished fetching all URLs.")
 
-    async def consumer(self):
+    def submit(self, item: Union[str, NewsPayload]):
         """
-        消费者：从队列取数据，进行 LLM 双流处理
+        雷达发现新条目时调用：放入 frontier 并登记到持久化队列
+        - str: 待抓取的文章 URL
+        - NewsPayload: 雷达已经拿到内容的条目 (如快讯接口)，跳过抓取直接进快通道
+        frontier 已满时抛出 asyncio.QueueFull，由调用方决定如何处理
         """
-        total_crawled = 0
-        passed_fast = 0
-        got_analysis = 0
+        self.frontier.put_nowait(item)
+        if self.workqueue:
+            if isinstance(item, NewsPayload):
+                self.workqueue.checkpoint("fast", news=item)
+            else:
+                self.workqueue.record_url(item)
+
+    async def resume(self):
+        """
+        从持久化队列恢复上次未完成的条目，各自放回所在的那一级
+        """
+        if not self.workqueue:
+            return
+        pending = self.workqueue.pending()
+        if not pending:
+            return
+        logger.info(f"♻️ Resuming {len(pending)} unfinished items from durable queue...")
+        for key, stage, url, payload in pending:
+            try:
+                if stage == "frontier":
+                    await self.frontier.put(url)
+                elif stage == "fast":
+                    await self.queue.put(NewsPayload.model_validate_json(payload))
+                elif stage == "hydrate":
+                    await self.hydrate_queue.put(NewsPayload.model_validate_json(payload))
+                elif stage == "slow":
+                    await self.slow_queue.put(NewsPayload.model_validate_json(payload))
+                elif stage == "persist":
+                    await self.persist_queue.put(SignalAnalysis.model_validate_json(payload))
+            except Exception as e:
+                logger.error(f"Failed to resume {url} at {stage} stage: {e}")
+                self.workqueue.ack_keys(key)
 
+    async def feeder(self):
+        """
+        常驻生产者：持续从 frontier 取条目，URL 并发抓取，已有内容的直接入队，遇到哨兵退出
+        抓取槽位占满时停止从 frontier 取数，积压留在 frontier 中
+        """
         while True:
-            news = await self.queue.get()
-            if news is None:
-                self.queue.task_done()
-                break 
-            
-            total_crawled += 1
+            item = await self.frontier.get()
+            if item is None:
+                break
+            if isinstance(item, NewsPayload):
+                # 内容已由雷达带回，不再重复请求
+                await self.queue.put(item)
+            else:
+                await self._spawn_crawl(item)
 
-            try:
-                # === 诊断插桩：强制保存 Raw Data ===
-                # 只要抓到了，先存下来，证明我们来过
-                raw_filename = f"raw_{int(asyncio.get_event_loop().time() * 1000)}.txt"
-                raw_path = settings.DATA_RAW_DIR / raw_filename
-                
-                # 简单的写文件操作
-                try:
-                    async with aiofiles.open(raw_path, mode='w', encoding='utf-8') as f:
-                        await f.write(f"URL: {news.url}\nTITLE: {news.title}\nCONTENT:\n{news.content}")
-                except Exception as save_err:
-                    logger.error(f"Failed to save raw: {save_err}")
-                # =================================
-
-                # 1. Fast Path
-                if await self.engine.fast_path_filter(news):
-                    passed_fast += 1
-                    logger.info(f"⚡ Entering Slow Path: {news.title[:30]}...")
-                    analysis = await self.engine.slow_path_analyze(news)
-                    
-                    if analysis:
-                        got_analysis += 1
-                        # Quality Check
-                        is_high_quality = SignalFilter.is_tradable(analysis, self.calibrator)
-                        
-                        await self.save_result(analysis)
-                        
-                        log_msg = f"Signal: Score {analysis.score} | Certainty {analysis.certainty} | {analysis.related_stocks}"
-                        if is_high_quality:
-                            logger.success(f"💎 [HIGH QUALITY] {log_msg}")
-                        else:
-                            logger.info(f"🎯 {log_msg}")
-                
-                # 哪怕是 Noise，因为前面已经 save raw 了，这里就不需要额外操作了
+        # 退出前等待在途抓取全部完成
+        await asyncio.gather(*list(self.crawl_tasks), return_exceptions=True)
 
-                # 每处理10条打印一次统计
-                if total_crawled % 10 == 0:
-                    logger.info(
-                        f"📈 Pipeline Stats: "
-                        f"Crawled={total_crawled} | "
-                        f"FastPass={passed_fast} | "
-                        f"ValidSignal={got_analysis}"
-                    )
+    async def _spawn_crawl(self, url: str) -> asyncio.Task:
+        """
+        先占一个抓取槽位再启动抓取任务 (有界扇出)
+        """
+        await self.crawl_slots.acquire()
+        task = asyncio.create_task(self._crawl_one(url))
+        self.crawl_tasks.add(task)
+        task.add_done_callback(self.crawl_tasks.discard)
+        return task
+
+    async def _crawl_one(self, url: str):
+        crawl_start = time.monotonic()
+        try:
+            result = await self.crawler.process_url(url)
+        except Exception as e:
+            logger.error(f"Signal Loss for {url}: {e}")
+            result = None
+        finally:
+            # 抓取完成即释放槽位，入队时的背压不占用抓取并发
+            self.crawl_slots.release()
 
+        if result and not isinstance(result, list):
+            result = [result]
+        result = result or []
+
+        crawl_end = time.monotonic()
+        for news in result:
+            mark(news, "crawl_start", crawl_start)
+            mark(news, "crawl_end", crawl_end)
+
+        if self.workqueue:
+            for news in result:
+                self.workqueue.checkpoint("fast", news=news)
+            # API 地址这类"生成器" URL 本身不对应一条新闻，抓完即可移除
+            # (快讯即使用接口地址占位，也按条目 ID 单独成行)
+            if not any(item_key(news) == item_key(url) for news in result):
+                self.workqueue.drop(url)
+        if self.on_settled and not any(news.url == url for news in result):
+            # 抓取失败或生成器 URL：不会再有后续结果，到此就算处理完
+            self.on_settled(url)
+
+        for news in result:
+            await self.queue.put(news)
+
+    def start_workers(self):
+        """
+        为每一级启动对应数量的 worker
+        """
+        if self.stage_tasks:
+            return
+        self.archive.start()
+        self.signal_writer.start()
+        for name, queue, handler, workers in self.stages:
+            self.stage_tasks[name] = [
+                asyncio.create_task(self._stage_worker(name, worker_id, queue, handler))
+                for worker_id in range(workers)
+            ]
+        layout = " -> ".join(f"{name}x{workers}" for name, _, _, workers in self.stages)
+        logger.info(f"👷 Pipeline workers started: {layout}")
+
+    async def stop_workers(self):
+        """
+        优雅关闭：按数据流向逐级发送哨兵
+        上游全部退出后再关闭下游，保证在途数据全部处理完毕
+        """
+        for name, queue, _, _ in self.stages:
+            tasks = self.stage_tasks.get(name, [])
+            if name == "hydrate":
+                await self._drain_handoffs()
+            for _ in tasks:
+                await queue.put(None)
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.stage_tasks = {}
+        await self.archive.close()
+        await self.signal_writer.close()
+        await self.crawler.close()
+        await self.engine.close()
+        self.tracer.flush()
+        if self.neardup:
+            self.neardup.flush()
+        if self.workqueue:
+            self.workqueue.close()
+
+    async def _stage_worker(self, stage: str, worker_id: int, queue: asyncio.Queue, handler):
+        """
+        通用 worker 循环：取数据 -> 处理 -> task_done，遇到哨兵退出
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                queue.task_done()
+                break
+            try:
+                await handler(item)
             except Exception as e:
-                logger.exception(f"Pipeline Error processing {news.url}: {e}")
+                logger.exception(f"Pipeline Error in {stage} stage: {e}")
+                if isinstance(item, NewsPayload):
+                    # 出错的簇首不能一直挂着它的跟随者
+                    await self._settle_cluster(item, analysed=False, stage=stage)
             finally:
-                self.queue.task_done()
+                queue.task_done()
+
+        logger.debug(f"{stage} worker #{worker_id} exited.")
+
+    async def fast_stage(self, news: NewsPayload):
+        """
+        快通道：保存原始数据 + 标题过滤，相关新闻送入慢通道 (只有标题的先去补全文)
+        """
+        self.stats['crawled'] += 1
+        mark(news, "fast_start")
+
+        # === 诊断插桩：强制保存 Raw Data ===
+        # 只要抓到了，先存下来，证明我们来过 (交给后台归档 writer，不在这里做磁盘 IO)
+        # 只有标题的条目若要去补全文，由补全文阶段归档完整版本，每条只写一次
+        archived = news.content is not None
+        if archived:
+            await self.archive.append(news)
+        to_hydrate = False
+
+        try:
+            if self._is_stale(news) and settings.SHED_POLICY == "skip":
+                # 已经过期的条目连快通道都不必走
+                self._shed(news, "shed_skipped")
+                return
+
+            if self.neardup:
+                # 窗口外仍没有结果的簇首，由挂起的跟随者接替
+                for promoted in self.neardup.expire():
+                    await self._dispatch_promoted(promoted, "fast")
+                leader = self.neardup.match_or_add(news)
+                if leader:
+                    logger.info(f"🔗 [NearDup] {news.source}: {news.title[:30]}... -> {leader}")
+                    # 簇首还没结果时挂起 (不 ack)，簇首失败时由它接替
+                    if not self.neardup.hold(news, leader):
+                        self._close_duplicate(news)
+                    return
 
+            relevant = await self.engine.fast_path_filter(news)
+            mark(news, "fast_end")
+            if relevant:
+                self.stats['fast_pass'] += 1
+                # 只有标题的条目先去补全文，已有内容的直接进慢通道
+                to_hydrate = news.content is None
+                next_stage, next_queue = ("hydrate", self.hydrate_queue) if to_hydrate else ("slow", self.slow_queue)
+                if self.workqueue:
+                    self.workqueue.checkpoint(next_stage, news=news)
+                # 下游满时在这里等待，背压传导到抓取端
+                await next_queue.put(news)
+            else:
+                self._finish(news.trace, news.url, "noise")
+                if self.workqueue:
+                    self.workqueue.ack(news)
+                await self._settle_cluster(news, analysed=True, stage="fast")
+            # 哪怕是 Noise，因为前面已经 save raw 了，这里就不需要额外操作了
+        finally:
+            if not archived and not to_hydrate:
+                await self.archive.append(news)
+            # 每处理10条打印一次统计
+            if self.stats['crawled'] % 10 == 0:
+                self.log_stats()
+
+    async def hydrate_stage(self, news: NewsPayload):
+        """
+        补全文：标题已通过快通道的条目才抓取正文 (大部分噪声在标题阶段就被挡掉，不消耗 Jina 请求)
+        """
+        mark(news, "hydrate_start")
+        if self._is_stale(news) and settings.SHED_POLICY == "skip":
+            # 反正要在慢通道丢弃，不必再抓全文
+            await self.archive.append(news)
+            self._shed(news, "shed_skipped")
+            await self._settle_cluster(news, analysed=False, stage="hydrate")
+            return
+        if not await self.crawler.hydrate(news):
+            # 抓取失败也留下只有标题的记录
+            await self.archive.append(news)
+            self.stats['hydrate_failed'] += 1
+            self._finish(news.trace, news.url, "crawl_failed")
+            if self.workqueue:
+                self.workqueue.ack(news)
+            await self._settle_cluster(news, analysed=False, stage="hydrate")
+            return
+        mark(news, "hydrate_end")
+        self.stats['hydrated'] += 1
+        # 归档补全后的版本 (快通道没有为它写过标题版)
+        await self.archive.append(news)
+        if self.workqueue:
+            self.workqueue.checkpoint("slow", news=news)
+        await self.slow_queue.put(news)
+
+    async def slow_stage(self, news: NewsPayload):
+        """
+        慢通道：Ensemble + 对抗验证的深度分析
+        排队超出延迟预算的条目按 SHED_POLICY 降级：跳过 / 单次廉价分析 / 廉价分析 + 时间衰减
+        """
+        mark(news, "slow_start")
+        if self._is_stale(news):
+            policy = settings.SHED_POLICY
+            if policy == "skip":
+                self._shed(news, "shed_skipped")
+                await self._settle_cluster(news, analysed=False, stage="slow")
+                return
+            logger.info(f"🐢 [Shed:{policy}] Cheap Path: {news.title[:30]}...")
+            analysis = await self.engine.cheap_analyze(news)
+            if analysis and policy == "downgrade":
+                # 信号按新闻年龄衰减 (短线信号半衰期最短)，确定性同步打折，让下游过滤真正感知到降级
+                original = analysis.score
+                decayed = apply_time_decay(analysis, self._news_age_seconds(news) / 3600)
+                analysis.score = int(round(decayed))
+                if original:
+                    analysis.certainty = int(round(analysis.certainty * decayed / original))
+                self.stats['shed_downgraded'] += 1
+            elif analysis:
+                self.stats['shed_cheap'] += 1
+        else:
+            logger.info(f"⚡ Entering Slow Path: {news.title[:30]}...")
+            analysis = await self.engine.slow_path_analyze(news)
+        mark(news, "slow_end")
+        if analysis:
+            analysis.item_id = news.item_id
+            self.stats['valid_signal'] += 1
+            if self.workqueue:
+                self.workqueue.checkpoint("persist", analysis=analysis)
+            self.pending_traces[item_key(analysis)] = (news.url, news.trace)
+            await self.persist_queue.put(analysis)
+        else:
+            self._finish(news.trace, news.url, "no_signal")
+            if self.workqueue:
+                self.workqueue.ack(news)
+        await self._settle_cluster(news, analysed=bool(analysis), stage="slow")
+
+    async def persist_stage(self, analysis: SignalAnalysis):
+        """
+        落盘：质量检查 + 写入 JSONL
+        """
+        pending = self.pending_traces.get(item_key(analysis))
+        if pending:
+            pending[1]["persist_start"] = time.monotonic()
+        is_high_quality = SignalFilter.is_tradable(analysis, self.calibrator)
+        
+        await self.save_result(analysis)
+        
+        log_msg = f"Signal: Score {analysis.score} | Certainty {analysis.certainty} | {analysis.related_stocks}"
+        if is_high_quality:
+            logger.success(f"💎 [HIGH QUALITY] {log_msg}")
+        else:
+            logger.info(f"🎯 {log_msg}")
+
+    @staticmethod
+    def _age_seconds(news: NewsPayload) -> float:
+        """
+        端到端排队时长：从抓取时刻算起 (重启恢复的条目也保留原始时间)
+        """
+        return (datetime.now() - news.fetched_at).total_seconds()
+
+    @staticmethod
+    def _news_age_seconds(news: NewsPayload) -> float:
+        """
+        新闻年龄：有源头发布时间时从发布时刻算起，否则退回抓取时刻
+        """
+        return (datetime.now() - (news.published_at or news.fetched_at)).total_seconds()
+
+    def _is_stale(self, news: NewsPayload) -> bool:
+        budget = settings.LATENCY_BUDGET_SECONDS
+        return budget > 0 and self._age_seconds(news) > budget
+
+    def _shed(self, news: NewsPayload, counter: str):
+        self.stats[counter] += 1
+        self._finish(news.trace, news.url, "shed")
+        logger.info(f"🗑️ [Shed] Dropped stale item ({self._age_seconds(news):.0f}s old): {news.title[:30]}...")
+        if self.workqueue:
+            self.workqueue.ack(news)
+
+    def _finish(self, trace: dict, url: str, outcome: str):
+        """
+        条目的最终结果：记录阶段耗时，并通知雷达该 URL 已处理完
+        """
+        self.tracer.record(trace, url, outcome)
+        if self.on_settled:
+            self.on_settled(url)
+
+    def _close_duplicate(self, news: NewsPayload):
+        self.stats['near_dup'] += 1
+        self._finish(news.trace, news.url, "duplicate")
+        if self.workqueue:
+            self.workqueue.ack(news)
+
+    async def _settle_cluster(self, news: NewsPayload, analysed: bool, stage: str):
+        """
+        簇首有了结果：分析过则关闭挂起的跟随者；被丢弃 / 补全文失败 / 无信号时提拔一篇跟随者接着走
+        """
+        if not self.neardup:
+            return
+        followers, promoted = self.neardup.resolve(news.url, analysed)
+        for follower in followers:
+            self._close_duplicate(follower)
+        if promoted is None:
+            return
+        logger.info(f"⤴️ [NearDup] Promoted {promoted.url} to replace {news.url}")
+        await self._dispatch_promoted(promoted, stage)
+
+    async def _dispatch_promoted(self, promoted: NewsPayload, stage: str):
+        """
+        把接替者送往下游，worker 永远不阻塞在自己这一级的有界队列上 (队列满时会死锁)：
+        - 只有标题：不占用 LLM worker 抓全文，非阻塞地交回补全文队列
+        - 慢通道里的接替者：直接在当前 worker 里做慢通道分析
+        - 其他阶段：正常放进下游的慢通道队列 (普通背压)
+        """
+        if promoted.content is None:
+            if self.workqueue:
+                self.workqueue.checkpoint("hydrate", news=promoted)
+            self.handoffs += 1
+            task = asyncio.create_task(self.hydrate_queue.put(promoted))
+            self.handoff_tasks.add(task)
+            task.add_done_callback(self.handoff_tasks.discard)
+        elif stage == "slow":
+            await self.slow_stage(promoted)
+        else:
+            if self.workqueue:
+                self.workqueue.checkpoint("slow", news=promoted)
+            await self.slow_queue.put(promoted)
+
+    async def _drain_handoffs(self):
+        """
+        关闭补全文阶段前排空回流：慢通道 / 补全文的接替者会被交回补全文队列，
+        直到一整轮等待中没有新的交接，两级都空闲后才能安全发送哨兵
+        """
+        while True:
+            handoffs = self.handoffs
+            await asyncio.gather(*list(self.handoff_tasks), return_exceptions=True)
+            await self.hydrate_queue.join()
+            await self.slow_queue.join()
+            if self.handoffs == handoffs:
+                return
+
+    def _on_signals_flushed(self, batch: list[SignalAnalysis]):
+        """
+        信号真正写入文件后才确认完成 (ack-on-completion)
+        """
+        if self.workqueue:
+            self.workqueue.ack(*batch)
+        written = time.monotonic()
+        for analysis in batch:
+            pending = self.pending_traces.pop(item_key(analysis), None)
+            if pending:
+                url, trace = pending
+                trace["written"] = written
+                self._finish(trace, url, "signal")
+
+    def log_stats(self):
+        logger.info(
+            f"📈 Pipeline Stats: "
+            f"Crawled={self.stats['crawled']} | "
+            f"FastPass={self.stats['fast_pass']} | "
+            f"Hydrated={self.stats['hydrated']}(fail {self.stats['hydrate_failed']}) | "
+            f"ValidSignal={self.stats['valid_signal']} | "
+            f"Shed(skip/cheap/down)="
+            f"{self.stats['shed_skipped']}/{self.stats['shed_cheap']}/{self.stats['shed_downgraded']} | "
+            f"NearDup={self.stats['near_dup']} | "
+            f"Queues(fast/hydrate/slow/persist)="
+            f"{self.queue.qsize()}/{self.hydrate_queue.qsize()}/{self.slow_queue.qsize()}/{self.persist_queue.qsize()}"
+        )
+        latency = self.tracer.summary()
+        if latency:
+            logger.info(f"⏱️ Stage Latency (p50/p95/p99): {latency}")
+        self.tracer.flush()
+        if self.neardup:
+            self.neardup.flush()
                 
     async def save_result(self, analysis: SignalAnalysis):
         """
-        保存结果到 JSONL
+        保存结果到 JSONL (交给后台批量 writer)
         """
-        file_path = settings.DATA_SIGNAL_DIR / f"signals_{analysis.time_horizon}.jsonl"
-        async with aiofiles.open(file_path, mode='a', encoding='utf-8') as f:
-            await f.write(analysis.model_dump_json() + "\n")
+        await self.signal_writer.write(analysis)
 
     async def run(self, urls: list[str]):
         logger.info("🚀 FinNewsMasterV1 System Launching...")
         logger.info(f"HARDWARE: Max GPU Concurrency = {settings.MAX_GPU_CONCURRENCY}")
         
-        # 并发运行生产者和消费者
-        producer_task = asyncio.create_task(self.producer(urls))
-        consumer_task = asyncio.create_task(self.consumer())
+        # 并发运行生产者和各级 worker
+        self.start_workers()
+        await self.producer(urls)
         
         # 等待所有任务完成
-        await asyncio.gather(producer_task, consumer_task)
+        await self.stop_workers()
         logger.info("✅ All tasks completed.")
 
 
@@ -131,33 +549,42 @@ async def main_loop():
     logger.info("🚀 FinNewsMasterV1: AUTO-PILOT MODE ENGAGED")
     
     pipeline = FinNewsPipeline()
-    monitor = NewsMonitor()
+    # 雷达复用爬虫的会话/解析器/游标，快讯接口每次轮询只请求一次
+    monitor = NewsMonitor(crawler=pipeline.crawler)
+    # 条目处理完才把去重记录落盘，崩溃时在途的 URL 重启后会被重新发现
+    pipeline.on_settled = monitor.seen_urls.settle
+    if pipeline.workqueue:
+        # 重启后预热去重集合，已处理或在途的 URL 不会被再次抛出
+        monitor.seen_urls.update(pipeline.workqueue.known_urls())
     
-    # 启动消费者任务 (后台一直运行，等待处理数据)
-    consumer_task = asyncio.create_task(pipeline.consumer())
+    # 启动各级 worker (后台一直运行，等待处理数据)
+    pipeline.start_workers()
+
+    # 雷达和生产者各自独立运行，通过 URL 边界队列 (frontier) 解耦
+    # 下游再拥堵也不会拖慢扫描节奏
+    resume_task = asyncio.create_task(pipeline.resume())
+    monitor_task = asyncio.create_task(monitor.run_forever(pipeline.submit))
+    # 生产者不参与下面的 gather：Ctrl-C 时 asyncio.run 会取消主任务，
+    # gather 会连带取消其中的任务，生产者必须留到 finally 里用哨兵正常收尾
+    feeder_task = asyncio.create_task(pipeline.feeder())
     
     try:
-        while True:
-            # 1. 雷达扫描
-            logger.info("📡 Scanning markets for new intelligence...")
-            new_urls = await monitor.harvest()
-            
-            if new_urls:
-                # 2. 只有发现新链接时，才启动生产者放入队列
-                logger.info(f"📥 Feeding {len(new_urls)} URLs to pipeline...")
-                await pipeline.producer(new_urls)
-            else:
-                logger.info("💤 No new signals. Standing by.")
-            
-            # 3. 冷却时间 (比如每 60 秒扫一次，避免被封 IP)
-            await asyncio.sleep(30)
+        await asyncio.gather(resume_task, monitor_task)
             
     except KeyboardInterrupt:
         logger.warning("🛑 Manual Stop Signal Received.")
     finally:
-        # 优雅关闭：发送空信号给消费者，让它下班
-        await pipeline.queue.put(None)
-        await consumer_task
+        # 优雅关闭：先停雷达，再让生产者清空 frontier，最后逐级关闭 worker
+        resume_task.cancel()
+        monitor_task.cancel()
+        await asyncio.gather(resume_task, monitor_task, return_exceptions=True)
+        if not feeder_task.done():
+            await pipeline.frontier.put(None)
+            await asyncio.gather(feeder_task, return_exceptions=True)
+        # 生产者异常退出时也要等在途抓取落进快通道，再关闭会话和下游
+        await asyncio.gather(*list(pipeline.crawl_tasks), return_exceptions=True)
+        await pipeline.stop_workers()
+        monitor.close()
 
 
 if __name__ == "__main__":